@@ -1,6 +1,12 @@
 # Just a placeholder for the build script logic
-import PyInstaller.__main__
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import PyInstaller.__main__
+from core.asset_pack import PACK_FILE
+from pack_assets import pack
 
 def build():
     # Define assets to include
@@ -8,9 +14,13 @@ def build():
     # Format: (source, dest)
     add_data = [
         ('config', 'config'),
-        ('assets', 'assets')
+        ('assets', 'assets'),
+        (PACK_FILE, '.')
     ]
     
+    # Bake pre-scaled sprites so the exe doesn't decode and scale them at startup
+    pack()
+    
     # Construct the --add-data arguments
     # On Windows it is ';', on Linux/Mac it is ':'
     separator = ';' if os.name == 'nt' else ':'
@@ -0,0 +1,18 @@
+# Bakes every configured sprite, pre-scaled, into assets.pack
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from core.asset_pack import PACK_FILE, sprite_sizes, write_pack
+from core.config_loader import ConfigLoader
+
+def pack(out_path=PACK_FILE):
+    loader = ConfigLoader()
+    sprites = sprite_sizes(loader.load_enemies(), loader.load_weapons())
+    written = write_pack(out_path, sprites)
+    print(f"Packed {len(written)} of {len(sprites)} sprites into {out_path}")
+    return written
+
+if __name__ == "__main__":
+    pack()
@@ -1,31 +1,42 @@
 import pygame
+from core.config_loader import ConfigLoader
+
+MAGNET_RADIUS = 150
 
 class Gem(pygame.sprite.Sprite):
     def __init__(self, pos, player, value=1):
         super().__init__()
+        self.pool = None # Set by ObjectPool; collected gems are recycled through reset()
+        self.image = ConfigLoader.load_shape('rect', (8, 8), (0, 255, 255)) # Cyan gem
+        self.reset(pos, player, value)
+
+    def reset(self, pos, player, value=1):
         self.player = player
         self.value = value
-        self.image = pygame.Surface((8, 8))
-        self.image.fill((0, 255, 255)) # Cyan gem
         self.rect = self.image.get_rect(center=pos)
         self.pos = pygame.math.Vector2(pos)
         
         self.speed = 0
         self.max_speed = 12
         self.acceleration = 0.5
-        self.magnet_radius = 150
+        self.magnet_radius = MAGNET_RADIUS
         self.being_vacuumed = False
         
+    def kill(self):
+        release = self.pool is not None and self.alive()
+        super().kill()
+        if release:
+            self.pool.release(self)
+
     def vacuum(self):
         self.being_vacuumed = True
 
     def update(self):
-        # Check distance to player
+        # Only called for awake gems (see EntityManager.update_gems)
         player_pos = pygame.math.Vector2(self.player.rect.center)
         diff = player_pos - self.pos
         dist_sq = diff.length_squared()
         
-        # 150^2 = 22500
         should_move = self.being_vacuumed or (dist_sq < self.magnet_radius**2)
         
         if should_move:
@@ -1,48 +1,219 @@
 import pygame
 import random
+import math
+from array import array
+from core.profiler import FRAME_BUDGET_MS, RECOVER_THRESHOLD
 
-class Particle(pygame.sprite.Sprite):
-    def __init__(self, pos, color, speed=2, duration=30):
-        super().__init__()
-        self.image = pygame.Surface((4, 4))
-        self.image.fill(color)
-        self.rect = self.image.get_rect(center=pos)
-        self.pos = pygame.math.Vector2(pos)
-        
-        angle = random.uniform(0, 360)
-        speed = random.uniform(speed * 0.5, speed * 1.5)
-        
-        import math
-        rad = math.radians(angle)
-        self.velocity = pygame.math.Vector2(math.cos(rad) * speed, math.sin(rad) * speed)
-        
-        self.spawn_time = pygame.time.get_ticks()
-        self.duration = duration * (1000/60) # frames to ms approx or direct ms
+try:
+    import numpy as np # Optional: ages and moves every particle in a few array operations
+except ImportError:
+    np = None
 
-    def update(self):
-        self.pos += self.velocity
-        self.rect.center = self.pos
-        
-        # Fade out? For now just kill after time
-        if pygame.time.get_ticks() - self.spawn_time > self.duration:
-            self.kill()
+MAX_PARTICLES = 2048
+PARTICLE_SIZE = 4
+
+QUALITY_LEVELS = (
+    # (name, particle count scale, hit sparks)
+    ('minimal', 0.2, False),
+    ('low', 0.4, False),
+    ('medium', 0.7, True),
+    ('high', 1.0, True),
+)
+HIT_MERGE_CELL = 32 # Hits landing in the same cell during one step share a burst
+HIT_MERGE_MAX = 6 # Particles in one merged hit burst (before scaling)
 
 class ParticleSystem:
-    def __init__(self, all_sprites):
-        self.all_sprites = all_sprites
-        self.particles_group = pygame.sprite.Group()
+    """Fixed-capacity ring buffer of particles stored as parallel arrays.
 
-    def create_explosion(self, pos, color, count=10):
+    Particles are not sprites: positions, velocities and ages live in
+    ``array('d')`` columns, update() advances them all in one pass (whole
+    array operations when NumPy is installed, one loop otherwise) and
+    draw() issues a single Surface.blits call. When the budget is full the
+    oldest slot is overwritten, so a horde kill can never allocate more
+    than MAX_PARTICLES particles.
+    """
+
+    def __init__(self, clock, capacity=MAX_PARTICLES):
+        self.clock = clock
+        self.capacity = capacity
+        self.x = array('d', bytes(8 * capacity))
+        self.y = array('d', bytes(8 * capacity))
+        self.vx = array('d', bytes(8 * capacity))
+        self.vy = array('d', bytes(8 * capacity))
+        self.age = array('d', bytes(8 * capacity)) # ms
+        self.lifetime = array('d', bytes(8 * capacity)) # ms, 0 = free slot
+        self.images = [None] * capacity
+        self.head = 0 # Next slot to write
+        self.used = 0 # High-water mark of slots that may be live
+        self.live = 0
+        self.color_cache = {}
+        self.pending_hits = {} # (cell x, cell y, color) -> [pos, particle count]
+        self.set_quality(len(QUALITY_LEVELS) - 1)
+
+    def set_quality(self, level):
+        self.quality = level
+        self.quality_name, self.count_scale, self.hit_effects = QUALITY_LEVELS[level]
+
+    def scaled(self, count):
+        return max(1, round(count * self.count_scale))
+
+    def __len__(self):
+        return self.live
+
+    def get_image(self, color):
+        color = tuple(color)
+        image = self.color_cache.get(color)
+        if image is None:
+            image = pygame.Surface((PARTICLE_SIZE, PARTICLE_SIZE))
+            image.fill(color)
+            self.color_cache[color] = image
+        return image
+
+    def emit(self, pos, color, count, speed, duration):
+        image = self.get_image(color)
+        lifetime = duration * (1000/60) # frames to ms
+        px, py = pos
         for _ in range(count):
-            p = Particle(pos, color)
-            self.all_sprites.add(p)
-            self.particles_group.add(p)
-    
+            i = self.head
+            self.head = (i + 1) % self.capacity
+            if self.lifetime[i] == 0:
+                self.live += 1
+            self.used = max(self.used, i + 1)
+
+            rad = math.radians(random.uniform(0, 360))
+            s = random.uniform(speed * 0.5, speed * 1.5)
+            self.x[i] = px
+            self.y[i] = py
+            self.vx[i] = math.cos(rad) * s
+            self.vy[i] = math.sin(rad) * s
+            self.age[i] = 0.0
+            self.lifetime[i] = lifetime
+            self.images[i] = image
+
+    def create_explosion(self, pos, color, count=10):
+        self.emit(pos, color, self.scaled(count), speed=2, duration=30)
+
     def create_hit(self, pos, color=(255, 255, 255), count=3):
-        for _ in range(count):
-            p = Particle(pos, color, speed=4, duration=10)
-            self.all_sprites.add(p)
-            self.particles_group.add(p)
-            
+        # Queued and merged by region; the bursts are emitted by the next update()
+        if not self.hit_effects:
+            return
+        key = (int(pos[0]) // HIT_MERGE_CELL, int(pos[1]) // HIT_MERGE_CELL, tuple(color))
+        pending = self.pending_hits.get(key)
+        if pending is None:
+            self.pending_hits[key] = [pos, count]
+        else:
+            pending[1] += count
+
+    def flush_hits(self):
+        for (_, _, color), (pos, count) in self.pending_hits.items():
+            self.emit(pos, color, self.scaled(min(count, HIT_MERGE_MAX)), speed=4, duration=10)
+        self.pending_hits.clear()
+
     def update(self):
-        self.particles_group.update()
+        if self.pending_hits:
+            self.flush_hits()
+        if not self.live:
+            return
+        
+        if np is not None:
+            live = self.step_arrays()
+        else:
+            live = self.step_loop()
+
+        self.live = live
+        if not live:
+            # Everything expired: restart the ring so idle frames cost nothing
+            self.head = 0
+            self.used = 0
+
+    def step_loop(self):
+        dt = self.clock.dt
+        xs, ys, vxs, vys = self.x, self.y, self.vx, self.vy
+        ages, lifetimes = self.age, self.lifetime
+        live = 0
+        for i in range(self.used):
+            lifetime = lifetimes[i]
+            if lifetime == 0:
+                continue
+            age = ages[i] + dt
+            if age > lifetime:
+                lifetimes[i] = 0.0
+                self.images[i] = None
+                continue
+            ages[i] = age
+            xs[i] += vxs[i]
+            ys[i] += vys[i]
+            live += 1
+        return live
+
+    def step_arrays(self):
+        # Same rules as step_loop, on NumPy views of the slots in use
+        used = self.used
+        lifetimes = np.frombuffer(self.lifetime)[:used]
+        ages = np.frombuffer(self.age)[:used]
+        age = ages + self.clock.dt
+        active = lifetimes > 0
+        expired = active & (age > lifetimes)
+        moving = np.flatnonzero(active & ~expired)
+
+        ages[moving] = age[moving]
+        np.frombuffer(self.x)[moving] += np.frombuffer(self.vx)[moving]
+        np.frombuffer(self.y)[moving] += np.frombuffer(self.vy)[moving]
+        if expired.any():
+            lifetimes[expired] = 0.0
+            images = self.images
+            for i in np.flatnonzero(expired).tolist():
+                images[i] = None
+        return len(moving)
+
+    def draw(self, screen, camera, alpha=1.0):
+        if not self.live:
+            return
+
+        ox, oy = camera.offset(alpha)
+        # Particles move linearly, so step back along the velocity to interpolate
+        back = alpha - 1.0
+        half = PARTICLE_SIZE / 2
+        xs, ys, vxs, vys, images = self.x, self.y, self.vx, self.vy, self.images
+        screen.blits([
+            (images[i], (xs[i] + vxs[i] * back + ox - half, ys[i] + vys[i] * back + oy - half))
+            for i in range(self.used) if images[i] is not None
+        ], False)
+
+class EffectsQuality:
+    """Steps ParticleSystem quality down while recent frames are over budget.
+
+    Checked once per check_interval of game time against the p95 of the
+    last second of frames, so cosmetic work is cut well before the
+    Director starts throttling spawns. Quality climbs back one level at a
+    time once frames are comfortably under budget.
+    """
+
+    def __init__(self, particle_system, profiler, clock, frame_budget=FRAME_BUDGET_MS, check_interval=1000, window=60):
+        self.particle_system = particle_system
+        self.profiler = profiler
+        self.clock = clock
+        self.frame_budget = frame_budget
+        self.check_interval = check_interval
+        self.window = window
+        self.last_check_time = self.clock.get_ticks()
+
+    def update(self):
+        current_time = self.clock.get_ticks()
+        if current_time - self.last_check_time < self.check_interval:
+            return
+        self.last_check_time = current_time
+        
+        p95 = self.profiler.frame_time_percentile(95, min_samples=self.window, window=self.window)
+        if p95 is None:
+            return # Headless, or not enough frames yet
+            
+        level = self.particle_system.quality
+        if p95 > self.frame_budget and level > 0:
+            level -= 1
+        elif p95 < self.frame_budget * RECOVER_THRESHOLD and level < len(QUALITY_LEVELS) - 1:
+            level += 1
+        else:
+            return
+        self.particle_system.set_quality(level)
+        print(f"Effects: p95 frame {p95:.1f}ms, quality {self.particle_system.quality_name}")
@@ -1,16 +1,25 @@
 import pygame
 import math
 from core.config_loader import ConfigLoader
+from content.weapon_stats import WeaponStats
+from core.timestep import FIXED_DT
 
 class Projectile(pygame.sprite.Sprite):
-    def __init__(self, pos, target, config):
+    def __init__(self, pos, target, config, clock):
         super().__init__()
-        self.config = config
+        self.pool = None # Set by ObjectPool; dead projectiles are recycled through reset()
+        self.image_key = None
+        self.expiry = None
+        self.reset(pos, target, config, clock)
+
+    def reset(self, pos, target, config, clock):
+        self.stats = stats = WeaponStats.of(config, 'projectile')
+        self.clock = clock
         self.target_enemy = None
         
         # Determine target position and handle predictive targeting
         target_pos = target
-        self.damage = self.config.get('damage', 10)
+        self.damage = stats.damage
         
         # Check if target is an entity with pending_damage (duck typing)
         if hasattr(target, 'rect') and hasattr(target, 'pending_damage'):
@@ -18,21 +27,23 @@ class Projectile(pygame.sprite.Sprite):
             target_pos = target.rect.center
             self.target_enemy.pending_damage += self.damage
             
-        # Visuals
-        size = self.config.get('size', 8)
-        color = self.config.get('color', [255, 255, 0])
-        sprite_path = self.config.get('sprite', None)
-        
-        self.image = ConfigLoader.load_image(sprite_path, (size*2, size*2))
-        if self.image is None:
-            self.image = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-            pygame.draw.circle(self.image, color, (size, size), size)
+        # Visuals (reused when a recycled projectile keeps the same look)
+        size = stats.size
+        color = stats.color
+        sprite_path = stats.sprite
+        
+        image_key = (sprite_path, size, color)
+        if image_key != self.image_key:
+            self.image_key = image_key
+            self.image = ConfigLoader.load_image(sprite_path, (size*2, size*2))
+            if self.image is None:
+                self.image = ConfigLoader.load_shape('circle', (size*2, size*2), color)
             
         self.rect = self.image.get_rect(center=pos)
         self.pos = pygame.math.Vector2(pos)
         
         # Movement
-        speed = self.config.get('speed', 5.0)
+        speed = stats.speed
         direction = pygame.math.Vector2(target_pos) - self.pos
         if direction.length() > 0:
             self.velocity = direction.normalize() * speed
@@ -40,34 +51,43 @@ class Projectile(pygame.sprite.Sprite):
             self.velocity = pygame.math.Vector2(1, 0) * speed
             
         # Lifetime
-        self.spawn_time = pygame.time.get_ticks()
-        self.duration = self.config.get('duration', 2000)
-        self.penetration = self.config.get('penetration', 1)
+        self.spawn_time = self.clock.get_ticks()
+        self.duration = stats.duration
+        self.expiry = self.clock.call_later(self.duration, self.kill)
+        self.penetration = stats.penetration
 
     def update(self):
         self.pos += self.velocity
         self.rect.center = self.pos
-        
-        if pygame.time.get_ticks() - self.spawn_time > self.duration:
-            self.kill()
 
     def kill(self):
+        if self.expiry is not None:
+            self.expiry.cancel()
+            self.expiry = None
         if self.target_enemy:
              if self.target_enemy.alive():
                  self.target_enemy.pending_damage -= self.damage
              self.target_enemy = None 
+        release = self.pool is not None and self.alive()
         super().kill()
+        if release:
+            self.pool.release(self)
 
 class EnemyProjectile(pygame.sprite.Sprite):
-    def __init__(self, pos, target_pos, damage=10):
+    def __init__(self, pos, target_pos, clock, damage=10):
         super().__init__()
-        self.damage = damage
+        self.pool = None # Set by ObjectPool; dead projectiles are recycled through reset()
+        self.expiry = None # Scheduled by EntityManager.spawn_enemy_projectile
         
         size = 6
         color = (150, 0, 150) # Purple
         
-        self.image = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, color, (size, size), size)
+        self.image = ConfigLoader.load_shape('circle', (size*2, size*2), color)
+        self.reset(pos, target_pos, clock, damage)
+
+    def reset(self, pos, target_pos, clock, damage=10):
+        self.damage = damage
+        self.clock = clock
             
         self.rect = self.image.get_rect(center=pos)
         self.pos = pygame.math.Vector2(pos)
@@ -81,66 +101,85 @@ class EnemyProjectile(pygame.sprite.Sprite):
             self.velocity = pygame.math.Vector2(1, 0) * speed
             
         # Lifetime
-        self.spawn_time = pygame.time.get_ticks()
+        self.spawn_time = self.clock.get_ticks()
         self.duration = 3000
 
     def update(self):
         self.pos += self.velocity
         self.rect.center = self.pos
-        
-        if pygame.time.get_ticks() - self.spawn_time > self.duration:
-            self.kill()
+
+    def kill(self):
+        if self.expiry is not None:
+            self.expiry.cancel()
+            self.expiry = None
+        release = self.pool is not None and self.alive()
+        super().kill()
+        if release:
+            self.pool.release(self)
 
 class MeleeHitbox(pygame.sprite.Sprite):
-    def __init__(self, player, config):
+    def __init__(self, player, config, clock):
         super().__init__()
         self.player = player
-        self.config = config
+        self.stats = stats = WeaponStats.of(config, 'melee')
+        self.clock = clock
         
-        area = self.config.get('area', [50, 50])
-        color = self.config.get('color', [255, 0, 0])
-        sprite_path = self.config.get('sprite', None)
+        area = stats.area
+        color = stats.color
+        sprite_path = stats.sprite
         
-        self.image = ConfigLoader.load_image(sprite_path, tuple(area))
+        self.image = ConfigLoader.load_image(sprite_path, area)
+        flippable = self.image is not None
         if self.image is None:
-            self.image = pygame.Surface(area, pygame.SRCALPHA)
-            self.image.fill(color)
+            self.image = ConfigLoader.load_shape('rect', area, color)
             
         self.rect = self.image.get_rect(center=player.rect.center)
         
         # Lifetime
-        self.spawn_time = pygame.time.get_ticks()
-        self.duration = self.config.get('duration', 200)
-        self.damage = self.config.get('damage', 10)
-        self.penetration = 999 
+        self.spawn_time = self.clock.get_ticks()
+        self.duration = stats.duration
+        self.expiry = self.clock.call_later(self.duration, self.kill)
+        self.damage = stats.damage
+        self.penetration = stats.penetration
 
         # Determine offset based on facing
         self.offset = pygame.math.Vector2(60, 0)
         if self.player.last_move.x < 0:
             self.offset.x = -60
-            # Flip image if needed
-            self.image = pygame.transform.flip(self.image, True, False)
+            # Flip image if needed (the fallback rect is symmetric)
+            if flippable:
+                self.image = pygame.transform.flip(self.image, True, False)
 
     def update(self):
         self.rect.center = self.player.rect.center + self.offset
-        
-        if pygame.time.get_ticks() - self.spawn_time > self.duration:
-            self.kill()
+
+    def kill(self):
+        self.expiry.cancel()
+        super().kill()
 
 class AxeProjectile(pygame.sprite.Sprite):
-    def __init__(self, pos, config):
+    def __init__(self, pos, config, clock):
         super().__init__()
-        self.config = config
-        self.damage = self.config.get('damage', 15)
-        
-        size = self.config.get('size', 10)
-        color = self.config.get('color', [139, 69, 19])
-        sprite_path = self.config.get('sprite', None)
-        
-        self.image = ConfigLoader.load_image(sprite_path, (size*2, size*2))
-        if self.image is None:
-            self.image = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-            pygame.draw.circle(self.image, color, (size, size), size)
+        self.pool = None # Set by ObjectPool; dead axes are recycled through reset()
+        self.image_key = None
+        self.expiry = None
+        self.reset(pos, config, clock)
+
+    def reset(self, pos, config, clock):
+        self.stats = stats = WeaponStats.of(config, 'axe')
+        self.clock = clock
+        self.damage = stats.damage
+        
+        size = stats.size
+        color = stats.color
+        sprite_path = stats.sprite
+        
+        image_key = (sprite_path, size, color)
+        if image_key != self.image_key:
+            self.image_key = image_key
+            self.image = ConfigLoader.load_image(sprite_path, (size*2, size*2))
+            if self.image is None:
+                self.image = ConfigLoader.load_shape('circle', (size*2, size*2), color)
             
         self.rect = self.image.get_rect(center=pos)
         self.pos = pygame.math.Vector2(pos)
@@ -148,48 +187,54 @@ class AxeProjectile(pygame.sprite.Sprite):
         # Physics
         # Initial velocity: Up and slightly random X
         import random
-        self.velocity = pygame.math.Vector2(random.uniform(-2, 2), -self.config.get('speed', 12.0))
+        self.velocity = pygame.math.Vector2(random.uniform(-2, 2), -stats.speed)
         self.gravity = 0.5
         
-        self.spawn_time = pygame.time.get_ticks()
-        self.duration = self.config.get('duration', 3000)
-        self.penetration = 999 
+        self.spawn_time = self.clock.get_ticks()
+        self.duration = stats.duration
+        self.expiry = self.clock.call_later(self.duration, self.kill)
+        self.penetration = stats.penetration
 
     def update(self):
         self.velocity.y += self.gravity
         self.pos += self.velocity
         self.rect.center = self.pos
-        
-        if pygame.time.get_ticks() - self.spawn_time > self.duration:
-            self.kill()
+
+    def kill(self):
+        if self.expiry is not None:
+            self.expiry.cancel()
+            self.expiry = None
+        release = self.pool is not None and self.alive()
+        super().kill()
+        if release:
+            self.pool.release(self)
             
 class AuraHitbox(pygame.sprite.Sprite):
     def __init__(self, player, config):
         super().__init__()
         self.player = player
-        self.config = config
+        self.stats = stats = WeaponStats.of(config, 'aura')
         
-        area = self.config.get('area', [100, 100])
-        color = self.config.get('color', [255, 255, 200])
-        sprite_path = self.config.get('sprite', None)
+        area = stats.area
+        color = stats.color
+        sprite_path = stats.sprite
         
         # Semi-transparent circle
-        self.image = ConfigLoader.load_image(sprite_path, tuple(area))
+        self.image = ConfigLoader.load_image(sprite_path, area)
         if self.image is None:
-            self.image = pygame.Surface(area, pygame.SRCALPHA)
-            pygame.draw.circle(self.image, (*color, 50), (area[0]//2, area[1]//2), area[0]//2)
+            self.image = ConfigLoader.load_shape('circle', area, color[:3], alpha=50)
             
         self.rect = self.image.get_rect(center=player.rect.center)
         
-        self.damage = self.config.get('damage', 3)
-        self.penetration = 999
+        self.damage = stats.damage
+        self.penetration = stats.penetration
         self.tick_timer = 0
-        self.tick_rate = self.config.get('cooldown', 200)
+        self.tick_rate = stats.cooldown
 
     def update(self):
         self.rect.center = self.player.rect.center
         
-        self.tick_timer += 16 # approx 60fps
+        self.tick_timer += FIXED_DT
         if self.tick_timer >= self.tick_rate:
             self.tick_timer = 0
             self.active_damage_frame = True
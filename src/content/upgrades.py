@@ -1,10 +1,12 @@
 import random
 import pygame
+from core.text import TextCache
 
 class UpgradeManager:
     def __init__(self, player, weapon_controller):
         self.player = player
         self.weapon_controller = weapon_controller
+        self.overlay = None
         
         # Base stat upgrades
         self.stat_upgrades = [
@@ -76,25 +78,24 @@ class UpgradeManager:
                     config['damage'] = config.get('damage', 1) + upgrade['amount']
                 elif upgrade['stat'] == 'cooldown':
                     config['cooldown'] = int(config.get('cooldown', 1000) * upgrade['amount'])
+            self.weapon_controller.refresh_stats()
                     
         elif upgrade['type'] == 'modifier':
             stat = upgrade['stat']
             self.weapon_controller.modifiers[stat] += upgrade['amount']
+            self.weapon_controller.refresh_stats()
             
         elif upgrade['type'] == 'new_weapon':
             self.weapon_controller.add_weapon(upgrade['id'])
 
     def draw_menu(self, screen, options, selected_index=0):
-        # Simple overlay
-        overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        screen.blit(overlay, (0, 0))
+        # Simple overlay (built once)
+        if self.overlay is None or self.overlay.get_size() != screen.get_size():
+            self.overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+            self.overlay.fill((0, 0, 0, 180))
+        screen.blit(self.overlay, (0, 0))
         
-        font_title = pygame.font.SysFont(None, 48)
-        font_opt = pygame.font.SysFont(None, 36)
-        font_desc = pygame.font.SysFont(None, 24)
-        
-        title = font_title.render("LEVEL UP!", True, (255, 215, 0))
+        title = TextCache.render("LEVEL UP!", 48, (255, 215, 0))
         screen.blit(title, (screen.get_width()//2 - title.get_width()//2, 100))
         
         y = 200
@@ -106,12 +107,12 @@ class UpgradeManager:
             text = f"{prefix}{i+1}. {opt['name']}"
             desc = opt['desc']
             
-            surf_text = font_opt.render(text, True, color)
-            surf_desc = font_desc.render(desc, True, (200, 200, 200))
+            surf_text = TextCache.render(text, 36, color)
+            surf_desc = TextCache.render(desc, 24, (200, 200, 200))
             
             screen.blit(surf_text, (screen.get_width()//2 - surf_text.get_width()//2, y))
             screen.blit(surf_desc, (screen.get_width()//2 - surf_desc.get_width()//2, y + 30))
             y += 100
             
-        hint = font_desc.render("Press A or Enter to select", True, (150, 150, 150))
+        hint = TextCache.render("Press A or Enter to select", 24, (150, 150, 150))
         screen.blit(hint, (screen.get_width()//2 - hint.get_width()//2, y + 50))
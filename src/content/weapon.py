@@ -1,9 +1,22 @@
+import copy
+import heapq
+import itertools
 import pygame
-from content.projectile import Projectile, MeleeHitbox, AxeProjectile, AuraHitbox
+from content.projectile import MeleeHitbox, AuraHitbox
+from content.weapon_stats import BASE_MODIFIERS, MIN_COOLDOWN, WeaponStats
+from core.clock import GameClock
 
 class WeaponController:
-    def __init__(self, player, entity_manager, config_loader, stats):
+    """Owns the player's weapons and fires them as their cooldowns come up.
+
+    Each owned weapon carries a compiled WeaponStats record ('stats'), rebuilt
+    by refresh_stats() when an upgrade changes its config or the global
+    modifiers. Firing is driven by a heap of next-fire times, so update()
+    only touches weapons that are actually due this step.
+    """
+    def __init__(self, player, entity_manager, config_loader, stats, clock=None):
         self.player = player
+        self.clock = clock if clock is not None else GameClock()
         self.entity_manager = entity_manager
         self.all_sprites = entity_manager.all_sprites
         self.projectiles_group = entity_manager.projectiles_group
@@ -18,13 +31,11 @@ class WeaponController:
         self.active_weapons = []
         
         # Global Modifiers
-        self.modifiers = {
-            'amount': 0,
-            'area': 1.0,
-            'speed': 1.0,
-            'duration': 1.0,
-            'cooldown': 1.0
-        }
+        self.modifiers = dict(BASE_MODIFIERS)
+
+        # (next fire time, sequence, weapon state) for every weapon that fires on a cooldown
+        self.fire_queue = []
+        self.sequence = itertools.count()
         
     def add_weapon(self, weapon_id):
         # Check if already owned
@@ -34,8 +45,7 @@ class WeaponController:
                 return
 
         if weapon_id in self.weapon_configs:
-            # Deep copy config so we can modify it per instance if needed
-            import copy
+            # Deep copy config so upgrades can modify it per instance
             config = copy.deepcopy(self.weapon_configs[weapon_id])
             
             weapon_state = {
@@ -43,55 +53,67 @@ class WeaponController:
                 'last_fired': 0,
                 'level': 1,
                 'config': config,
+                'stats': WeaponStats(config, self.modifiers, weapon_id),
                 'instance': None # For persistent weapons like Aura
             }
             
             self.active_weapons.append(weapon_state)
             print(f"Added weapon: {config['name']}")
             
-            # Initialize persistent weapons immediately
-            if config.get('type') == 'aura':
+            if weapon_state['stats'].type == 'aura':
+                # Persistent weapons exist from the start and never go on cooldown
                 self.fire_weapon(weapon_state)
+            else:
+                self.schedule(weapon_state)
 
-    def update(self):
-        current_time = pygame.time.get_ticks()
-        
+    def schedule(self, weapon_state):
+        # Always strictly after the last shot, so update() can't refire a weapon within one step
+        last_fired = weapon_state['last_fired']
+        due = last_fired + max(weapon_state['stats'].cooldown, MIN_COOLDOWN)
+        heapq.heappush(self.fire_queue, (due, next(self.sequence), weapon_state))
+
+    def refresh_stats(self):
+        """Recompile every weapon's stats after an upgrade and reschedule on the new cooldowns."""
         for weapon in self.active_weapons:
-            config = weapon['config']
-            
-            # Apply cooldown modifier
-            base_cooldown = config.get('cooldown', 1000)
-            cooldown = base_cooldown * self.modifiers['cooldown']
-            
-            if current_time - weapon['last_fired'] >= cooldown:
-                # For Aura, we don't "fire" repeatedly in the same way, 
-                # but we might want to re-trigger or just let it exist.
-                # Actually Aura is persistent.
-                if config.get('type') != 'aura':
-                    weapon['last_fired'] = current_time
-                    self.fire_weapon(weapon)
+            weapon['stats'] = WeaponStats(weapon['config'], self.modifiers, weapon['id'])
+            aura = weapon['instance']
+            if aura is not None and aura.alive():
+                # Auras bake their stats in when created; swap in a fresh one
+                aura.kill()
+                self.fire_weapon(weapon)
+        self.fire_queue = []
+        for weapon in self.active_weapons:
+            if weapon['stats'].type != 'aura':
+                self.schedule(weapon)
+
+    def update(self):
+        current_time = self.clock.get_ticks()
+        queue = self.fire_queue
+        while queue and queue[0][0] <= current_time:
+            weapon = heapq.heappop(queue)[2]
+            weapon['last_fired'] = current_time
+            self.fire_weapon(weapon)
+            self.schedule(weapon)
                 
     def fire_weapon(self, weapon_state):
-        config = weapon_state['config']
-        w_type = config.get('type', 'projectile')
-        
-        # Apply modifiers
-        amount = 1 + self.modifiers['amount']
+        stats = weapon_state['stats']
+        w_type = stats.type
+        amount = stats.amount
         
         if w_type == 'projectile':
-            # Fire multiple projectiles if amount > 1
+            # One indexed query hands each projectile in the volley its own target
+            targets = self.get_best_targets(amount)
             for i in range(amount):
-                target = self.get_best_target()
-                if target:
-                    # Add slight spread or delay for multiple?
-                    # For simplicity, just fire at same target (or random if multiple)
-                    proj = Projectile(self.player.rect.center, target, config)
+                if targets:
+                    # More shots than viable targets: wrap around the nearest ones
+                    target = targets[i % len(targets)]
+                    proj = self.entity_manager.pools['projectile'].acquire(self.player.rect.center, target, stats, self.clock)
                     self.all_sprites.add(proj)
                     self.projectiles_group.add(proj)
                     self.stats.shots_fired += 1
                 else:
                     target_pos = self.player.rect.center + pygame.math.Vector2(100, 0)
-                    proj = Projectile(self.player.rect.center, target_pos, config)
+                    proj = self.entity_manager.pools['projectile'].acquire(self.player.rect.center, target_pos, stats, self.clock)
                     self.all_sprites.add(proj)
                     self.projectiles_group.add(proj)
                     self.stats.shots_fired += 1
@@ -99,7 +121,7 @@ class WeaponController:
         elif w_type == 'melee':
             # Whip
             # Amount could mean forward and backward?
-            melee = MeleeHitbox(self.player, config)
+            melee = MeleeHitbox(self.player, stats, self.clock)
             self.all_sprites.add(melee)
             self.projectiles_group.add(melee)
             self.stats.shots_fired += 1
@@ -112,7 +134,7 @@ class WeaponController:
 
         elif w_type == 'axe':
             for i in range(amount):
-                axe = AxeProjectile(self.player.rect.center, config)
+                axe = self.entity_manager.pools['axe'].acquire(self.player.rect.center, stats, self.clock)
                 # Spread X velocity slightly for multiple axes
                 if i > 0:
                     axe.velocity.x += (i * 2) * (-1 if i % 2 == 0 else 1)
@@ -123,20 +145,22 @@ class WeaponController:
 
         elif w_type == 'aura':
             if weapon_state['instance'] is None or not weapon_state['instance'].alive():
-                aura = AuraHitbox(self.player, config)
+                aura = AuraHitbox(self.player, stats)
                 self.all_sprites.add(aura)
                 self.projectiles_group.add(aura) # Add to projectiles for collision checks
                 weapon_state['instance'] = aura
 
     def get_best_target(self):
-        sprites = self.enemies_group.sprites()
-        if not sprites:
-            return None
-            
-        player_vec = pygame.math.Vector2(self.player.rect.center)
-        candidates = [e for e in sprites if e.hp > e.pending_damage]
-        if not candidates:
-            candidates = sprites
-            
-        nearest = min(candidates, key=lambda e: player_vec.distance_to(e.pos))
-        return nearest
+        targets = self.get_best_targets(1)
+        return targets[0] if targets else None
+
+    def get_best_targets(self, count):
+        """Return up to count distinct enemies nearest the player, preferring ones not already doomed."""
+        grid = self.entity_manager.enemy_grid
+        center = self.player.rect.center
+        
+        targets = grid.nearest(center, count, lambda e: e.hp > e.pending_damage)
+        if not targets:
+            # Everything is already covered by in-flight damage; overkill the nearest
+            targets = grid.nearest(center, count)
+        return targets
@@ -0,0 +1,63 @@
+BASE_MODIFIERS = {
+    'amount': 0,
+    'area': 1.0,
+    'speed': 1.0,
+    'duration': 1.0,
+    'cooldown': 1.0
+}
+
+MIN_COOLDOWN = 1 # ms; stacked cooldown upgrades can't make a weapon fire more than once per step
+
+# Per weapon type fallbacks for keys a config leaves out
+TYPE_DEFAULTS = {
+    'projectile': {'damage': 10, 'cooldown': 1000, 'speed': 5.0, 'duration': 2000, 'size': 8,
+                   'area': [50, 50], 'color': [255, 255, 0], 'penetration': 1},
+    'melee': {'damage': 10, 'cooldown': 1000, 'speed': 0.0, 'duration': 200, 'size': 8,
+              'area': [50, 50], 'color': [255, 0, 0], 'penetration': 999},
+    'axe': {'damage': 15, 'cooldown': 1000, 'speed': 12.0, 'duration': 3000, 'size': 10,
+            'area': [50, 50], 'color': [139, 69, 19], 'penetration': 999},
+    'aura': {'damage': 3, 'cooldown': 200, 'speed': 0.0, 'duration': -1, 'size': 8,
+             'area': [100, 100], 'color': [255, 255, 200], 'penetration': 999},
+}
+
+class WeaponStats:
+    """Effective stats of one weapon: its config, with per-weapon upgrades
+    already folded in, scaled by the controller's global modifiers.
+
+    WeaponController compiles one per owned weapon and only rebuilds them
+    when an upgrade changes something, so firing reads plain attributes
+    instead of looking keys up and multiplying on every shot. Projectiles
+    take the record as is; a bare config dict is compiled without modifiers.
+    """
+    __slots__ = (
+        'weapon_id', 'name', 'type',
+        'damage', 'cooldown', 'speed', 'duration', 'size', 'area',
+        'color', 'sprite', 'penetration', 'amount',
+    )
+
+    def __init__(self, config, modifiers=BASE_MODIFIERS, weapon_id=None, weapon_type=None):
+        self.weapon_id = weapon_id
+        self.name = config.get('name', weapon_id)
+        self.type = weapon_type or config.get('type', 'projectile')
+        defaults = TYPE_DEFAULTS.get(self.type, TYPE_DEFAULTS['projectile'])
+        get = lambda key: config.get(key, defaults[key])
+
+        self.damage = get('damage')
+        self.cooldown = max(MIN_COOLDOWN, get('cooldown') * modifiers['cooldown'])
+        self.speed = get('speed') * modifiers['speed']
+        duration = get('duration')
+        self.duration = duration * modifiers['duration'] if duration > 0 else duration # -1 = persistent
+        self.size = get('size')
+        self.area = tuple(int(a * modifiers['area']) for a in get('area'))
+        self.color = tuple(get('color'))
+        self.sprite = config.get('sprite', None)
+        self.penetration = get('penetration')
+        self.amount = 1 + modifiers['amount']
+
+    @classmethod
+    def of(cls, config, weapon_type):
+        """config itself if it is already compiled, else its modifier-free stats."""
+        return config if isinstance(config, cls) else cls(config, weapon_type=weapon_type)
+
+    def __repr__(self):
+        return f"WeaponStats({self.weapon_id!r}, {self.type!r})"
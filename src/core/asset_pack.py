@@ -0,0 +1,101 @@
+import json
+import mmap
+import os
+import struct
+import pygame
+
+PACK_FILE = "assets.pack"
+MAGIC = b"VSPK2\n"
+HEADER = struct.Struct("<I") # Length of the JSON index that follows MAGIC
+
+def pack_key(path, size=None):
+    return path if size is None else f"{path}@{size[0]}x{size[1]}"
+
+def sprite_sizes(enemies, weapons):
+    """Every (sprite path, size) pair the game asks ConfigLoader.load_image for."""
+    sizes = {("assets/ground.png", None)}
+    for enemy in enemies.values():
+        if enemy.get('sprite'):
+            sizes.add((enemy['sprite'], (enemy.get('width', 32), enemy.get('height', 32))))
+    for weapon in weapons.values():
+        if not weapon.get('sprite'):
+            continue
+        if weapon.get('type') in ('melee', 'aura'):
+            sizes.add((weapon['sprite'], tuple(weapon.get('area', [50, 50]))))
+        else:
+            size = weapon.get('size', 8)
+            sizes.add((weapon['sprite'], (size*2, size*2)))
+    return sizes
+
+def write_pack(out_path, sprites, base_path="."):
+    """Bake sprites, already scaled, into one archive of raw RGBA pixels.
+
+    Each entry records its source file's mtime and size so a loader can
+    tell when the file was edited after packing. Sprites whose file is
+    missing are skipped; returns the keys written.
+    """
+    index = {}
+    blobs = []
+    offset = 0
+    for path, size in sorted(sprites, key=lambda s: pack_key(*s)):
+        full_path = os.path.join(base_path, path)
+        if not os.path.exists(full_path):
+            continue
+        image = pygame.image.load(full_path)
+        if size:
+            image = pygame.transform.scale(image, size)
+        data = pygame.image.tobytes(image, "RGBA")
+        st = os.stat(full_path)
+        index[pack_key(path, size)] = [offset, image.get_width(), image.get_height(), path, size,
+                                       [st.st_mtime_ns, st.st_size]]
+        blobs.append(data)
+        offset += len(data)
+
+    index_data = json.dumps(index).encode("utf-8")
+    with open(out_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(HEADER.pack(len(index_data)))
+        f.write(index_data)
+        for data in blobs:
+            f.write(data)
+    return list(index)
+
+class AssetPack:
+    """Read-only view of an archive written by write_pack.
+
+    The file is memory-mapped, so opening it costs one index parse and each
+    image is a single copy out of the page cache.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not an asset pack")
+        start = len(MAGIC) + HEADER.size
+        (index_size,) = HEADER.unpack_from(self.data, len(MAGIC))
+        self.index = json.loads(self.data[start:start + index_size])
+        self.data_start = start + index_size
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def sprites(self):
+        """(path, size) of every packed image, as load_image would request it."""
+        return [(entry[3], tuple(entry[4]) if entry[4] else None) for entry in self.index.values()]
+
+    def load(self, path, size=None, source_stamp=None):
+        """The packed image, or None if it isn't packed or source_stamp
+        ((mtime_ns, size) of the file now) differs from the packed one."""
+        entry = self.index.get(pack_key(path, size))
+        if entry is None:
+            return None
+        if source_stamp is not None and entry[5] != list(source_stamp):
+            return None # Edited since it was packed
+        offset, width, height = entry[:3]
+        start = self.data_start + offset
+        pixels = self.data[start:start + width * height * 4]
+        return pygame.image.frombytes(pixels, (width, height), "RGBA")
@@ -0,0 +1,66 @@
+import math
+import pygame
+
+GRID_SIZE = 64
+GROUND_COLOR = (30, 30, 30)
+GRID_COLOR = (40, 40, 40)
+
+def make_grid_tile(size=GRID_SIZE, color=GROUND_COLOR, line_color=GRID_COLOR):
+    """One cell of the default ground: flat colour with grid lines on its top/left edge."""
+    tile = pygame.Surface((size, size))
+    tile.fill(color)
+    pygame.draw.line(tile, line_color, (0, 0), (size - 1, 0))
+    pygame.draw.line(tile, line_color, (0, 0), (0, size - 1))
+    return tile
+
+class Background:
+    """Scrolling tiled ground rendered from a single cached surface.
+
+    Small tiles are pre-rendered once into a surface one tile larger than
+    the view, so each frame is one blit at the camera offset. Ground art at
+    least as large as the view is used as-is and wraps with at most four
+    blits.
+    """
+
+    def __init__(self, view_width, view_height, tile=None):
+        self.view_width = view_width
+        self.view_height = view_height
+        self.set_tile(tile if tile is not None else make_grid_tile())
+
+    def set_tile(self, tile):
+        self.tile_width, self.tile_height = tile.get_size()
+
+        # Repeat the tile until it covers the view plus one tile of scroll slack
+        cols = max(1, math.ceil(self.view_width / self.tile_width) + 1)
+        rows = max(1, math.ceil(self.view_height / self.tile_height) + 1)
+        if cols == 2 and self.tile_width >= self.view_width:
+            cols = 1 # Big ground art: wrap it instead of doubling its size
+        if rows == 2 and self.tile_height >= self.view_height:
+            rows = 1
+
+        surface = pygame.Surface((cols * self.tile_width, rows * self.tile_height))
+        surface.blits([
+            (tile, (col * self.tile_width, row * self.tile_height))
+            for col in range(cols) for row in range(rows)
+        ], False)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        self.surface = surface
+
+    def draw(self, screen, camera, alpha=1.0):
+        ox, oy = camera.offset(alpha)
+        width, height = self.surface.get_size()
+
+        # World origin sits at the camera offset; start one tile left/up of the view edge
+        x0 = int(ox % self.tile_width) - self.tile_width
+        y0 = int(oy % self.tile_height) - self.tile_height
+
+        blits = []
+        x = x0
+        while x < self.view_width:
+            y = y0
+            while y < self.view_height:
+                blits.append((self.surface, (x, y)))
+                y += height
+            x += width
+        screen.blits(blits, False)
@@ -0,0 +1,51 @@
+class Broadphase:
+    """Serves every collision pair query of a frame from shared spatial hashes.
+
+    Each layer is a SpatialHash that indexes one kind of collider by centre
+    plus a margin covering the largest half-extent inserted so far, so a
+    rect query only has to narrow-phase the sprites in nearby cells. The
+    candidate/hit counters are reset by begin_frame() and report how well
+    the grid prunes pairs.
+    """
+
+    def __init__(self):
+        self.layers = {} # name -> SpatialHash
+        self.margins = {} # name -> largest half-extent in the layer
+        self.candidate_pairs = 0
+        self.hits = 0
+
+    def add_layer(self, name, spatial_hash):
+        self.layers[name] = spatial_hash
+        self.margins[name] = 0
+
+    def insert(self, name, sprite):
+        rect = sprite.rect
+        self.margins[name] = max(self.margins[name], rect.width / 2, rect.height / 2)
+        self.layers[name].insert(sprite, rect.center)
+
+    def insert_many(self, name, sprites):
+        spatial_hash = self.layers[name]
+        margin = self.margins[name]
+        for sprite in sprites:
+            rect = sprite.rect
+            margin = max(margin, rect.width / 2, rect.height / 2)
+            spatial_hash.insert(sprite, rect.center)
+        self.margins[name] = margin
+
+    def remove(self, name, sprite):
+        self.layers[name].remove(sprite)
+
+    def move(self, name, sprite):
+        self.layers[name].move(sprite, sprite.rect.center)
+
+    def begin_frame(self):
+        self.candidate_pairs = 0
+        self.hits = 0
+
+    def query(self, name, rect):
+        """Return sprites in layer name whose rect collides with rect."""
+        candidates = self.layers[name].query_rect(rect, self.margins[name])
+        self.candidate_pairs += len(candidates)
+        hits = [sprite for sprite in candidates if rect.colliderect(sprite.rect)]
+        self.hits += len(hits)
+        return hits
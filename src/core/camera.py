@@ -5,6 +5,7 @@ class Camera:
         self.camera = pygame.Rect(0, 0, width, height)
         self.width = width
         self.height = height
+        self.previous_topleft = self.camera.topleft
 
     def apply(self, entity):
         return entity.rect.move(self.camera.topleft)
@@ -12,6 +13,16 @@ class Camera:
     def apply_rect(self, rect):
         return rect.move(self.camera.topleft)
 
+    def snapshot(self):
+        # Remember where the camera was before this simulation step
+        self.previous_topleft = self.camera.topleft
+
+    def offset(self, alpha=1.0):
+        # Camera offset interpolated between the last two simulation steps
+        px, py = self.previous_topleft
+        x, y = self.camera.topleft
+        return (px + (x - px) * alpha, py + (y - py) * alpha)
+
     def update(self, target):
         x = -target.rect.centerx + int(self.width / 2)
         y = -target.rect.centery + int(self.height / 2)
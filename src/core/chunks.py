@@ -0,0 +1,84 @@
+import struct
+
+CHUNK_SIZE = 1024
+ACTIVE_RADIUS = 2 # Chunks (Chebyshev) around the player's chunk that are always live
+FREEZE_RADIUS = 3 # Live things beyond this many chunks get frozen; the gap stops thrashing at borders
+RECORD = struct.Struct("<Biii") # kind, x, y, value
+
+class ChunkStore:
+    """Frozen contents of the world chunks the player has left behind.
+
+    The world is cut into CHUNK_SIZE squares. When the player changes chunk,
+    the owner freezes whatever is live beyond FREEZE_RADIUS into packed
+    RECORD entries (no sprites, no surfaces), and thaws the frozen chunks
+    that are back within ACTIVE_RADIUS. What stays live, and what each
+    frame costs, is then bounded by the area around the player rather than
+    by how far they have walked.
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE, active_radius=ACTIVE_RADIUS, freeze_radius=FREEZE_RADIUS):
+        self.chunk_size = chunk_size
+        self.active_radius = active_radius
+        self.freeze_radius = max(freeze_radius, active_radius)
+        self.frozen = {} # (chunk x, chunk y) -> bytearray of RECORDs
+        self.center = None # Chunk the player was in at the last recenter()
+
+    def __len__(self):
+        # Number of frozen records
+        return sum(len(data) for data in self.frozen.values()) // RECORD.size
+
+    def chunk_for(self, pos):
+        return (int(pos[0] // self.chunk_size), int(pos[1] // self.chunk_size))
+
+    def recenter(self, pos):
+        """Track the player; returns True when they entered a new chunk."""
+        chunk = self.chunk_for(pos)
+        if chunk == self.center:
+            return False
+        self.center = chunk
+        return True
+
+    def is_far(self, chunk):
+        cx, cy = self.center
+        return max(abs(chunk[0] - cx), abs(chunk[1] - cy)) > self.freeze_radius
+
+    def freeze(self, kind, x, y, value=0):
+        chunk = self.chunk_for((x, y))
+        data = self.frozen.get(chunk)
+        if data is None:
+            data = self.frozen[chunk] = bytearray()
+        data += RECORD.pack(kind, x, y, value)
+
+    def thaw_nearby(self):
+        """Remove and return (kind, x, y, value) for every record within ACTIVE_RADIUS."""
+        if not self.frozen:
+            return []
+        cx, cy = self.center
+        r = self.active_radius
+        records = []
+        for x in range(cx - r, cx + r + 1):
+            for y in range(cy - r, cy + r + 1):
+                data = self.frozen.pop((x, y), None)
+                if data is not None:
+                    records.extend(RECORD.iter_unpack(data))
+        return records
+
+    def pop_kind(self, kind):
+        """Remove and return (x, y, value) for every frozen record of one kind, in any chunk."""
+        records = []
+        for chunk, data in list(self.frozen.items()):
+            kept = bytearray()
+            for record in RECORD.iter_unpack(data):
+                if record[0] == kind:
+                    records.append(record[1:])
+                else:
+                    kept += RECORD.pack(*record)
+            if not kept:
+                del self.frozen[chunk]
+            elif len(kept) != len(data):
+                self.frozen[chunk] = kept
+        return records
+
+    def clear(self):
+        self.frozen.clear()
+        self.center = None
@@ -0,0 +1,59 @@
+from core.timestep import FixedTimestep, FIXED_DT
+from core.timers import TimerQueue
+
+class GameClock:
+    """Simulation time shared by every gameplay subsystem.
+
+    Game time only moves when step() is called, once per simulation update,
+    so pausing, menus and slow frames never leak into spawn timers,
+    cooldowns or lifetimes. advance() converts wall-clock frame time into
+    the number of steps owed, honouring pause and time_scale; headless runs
+    can skip it and call step() as fast as they like.
+
+    Lifetimes and cooldowns are registered with call_later() and fire from
+    step() once their game time comes due.
+    """
+
+    def __init__(self, dt=FIXED_DT):
+        self.dt = dt
+        self.ticks = 0.0 # ms of simulated time
+        self.time_scale = 1.0
+        self.paused = False
+        self.timestep = FixedTimestep(dt)
+        self.timers = TimerQueue()
+
+    def get_ticks(self):
+        return self.ticks
+
+    def step(self):
+        self.ticks += self.dt
+        if self.timers.heap:
+            self.timers.run_due(self.ticks)
+
+    def call_later(self, delay, callback, *args):
+        """Run callback(*args) on the first step at least delay ms of game time from now."""
+        return self.timers.schedule(self.ticks + delay, callback, *args)
+
+    def advance(self, frame_time):
+        # Returns how many simulation steps the given wall-clock ms are worth
+        if self.paused:
+            return 0
+        return self.timestep.advance(frame_time, self.time_scale)
+
+    @property
+    def alpha(self):
+        return self.timestep.alpha
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def set_time_scale(self, scale):
+        self.time_scale = max(0.0, scale)
+
+    def reset(self):
+        self.ticks = 0.0
+        self.timers.clear()
+        self.timestep.accumulator = 0.0
@@ -1,14 +1,75 @@
 import yaml
+import hashlib
+import marshal
 import os
 import sys
 import pygame
+from core.asset_pack import AssetPack, PACK_FILE
+
+# libyaml's loader is several times faster; fall back to pure Python without it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+CACHE_APP_NAME = "Vampire-Slopvivors" # Folder under the per-user cache directory
+CONFIG_CACHE_VERSION = 2
+
+COLORKEY = (255, 0, 255) # Transparent background of keyed procedural shapes
+
+def user_cache_dir():
+    """Per-user folder for compiled configs; it survives a onefile build's temp extraction dir."""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser(os.path.join("~", "AppData", "Local"))
+    elif sys.platform == "darwin":
+        base = os.path.expanduser(os.path.join("~", "Library", "Caches"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache"))
+    return os.path.join(base, CACHE_APP_NAME, "config")
+
+def draw_rect(surface, color):
+    surface.fill(color)
+
+def draw_circle(surface, color):
+    w, h = surface.get_size()
+    pygame.draw.circle(surface, color, (w//2, h//2), w//2)
+
+def draw_chest(surface, color):
+    w, h = surface.get_size()
+    surface.fill(color)
+    pygame.draw.rect(surface, (139, 69, 19), (w//16, h*5//16, w - 2*(w//16), h*5//8)) # Brown box
+    pygame.draw.circle(surface, (139, 69, 19), (w//2, h*5//16), w*7//16) # Lid
+
+def draw_magnet(surface, color):
+    w, h = surface.get_size()
+    surface.fill(color)
+    pygame.draw.circle(surface, (255, 255, 255), (w//2, h//2), w*3//8, max(1, w//8))
+
+def draw_heart(surface, color):
+    w, h = surface.get_size()
+    pygame.draw.circle(surface, color, (w//4, h*3//8), w//4)
+    pygame.draw.circle(surface, color, (w*3//4, h*3//8), w//4)
+    pygame.draw.polygon(surface, color, [(0, h//2), (w//2, h), (w, h//2)])
+
+# name -> (draw function, whether the shape has a transparent background)
+SHAPES = {
+    'rect': (draw_rect, False),
+    'circle': (draw_circle, True),
+    'chest': (draw_chest, False),
+    'magnet': (draw_magnet, False),
+    'heart': (draw_heart, True),
+}
 
 class ConfigLoader:
     _image_cache = {}
+    _config_cache = {} # config file path -> ((mtime_ns, size), parsed config)
+    _pack = None # AssetPack of pre-scaled sprites, opened on first use
+    _pack_checked = False
 
-    def __init__(self, config_dir="config"):
+    def __init__(self, config_dir="config", cache_dir=None):
         self.base_path = self.get_resource_path("")
         self.config_dir = os.path.join(self.base_path, config_dir)
+        self.cache_dir = cache_dir if cache_dir is not None else user_cache_dir()
         self.enemies = {}
         self.weapons = {}
 
@@ -24,32 +85,114 @@ class ConfigLoader:
         return os.path.join(base_path, relative_path)
         
     def load_enemies(self):
-        filepath = os.path.join(self.config_dir, "enemies.yaml")
-        if not os.path.exists(filepath):
-            print(f"Warning: {filepath} not found.")
-            return {}
-        
-        with open(filepath, 'r') as f:
-            data = yaml.safe_load(f)
-            
-        if data and 'enemies' in data:
-            for enemy in data['enemies']:
-                self.enemies[enemy['id']] = enemy
+        self.enemies = self.load_config("enemies.yaml", "enemies")
         return self.enemies
 
     def load_weapons(self):
-        filepath = os.path.join(self.config_dir, "weapons.yaml")
-        if not os.path.exists(filepath):
+        self.weapons = self.load_config("weapons.yaml", "weapons")
+        return self.weapons
+
+    def load_config(self, filename, section):
+        """The `section` list of a config file as {id: entry}.
+
+        Parsed configs are shared by every ConfigLoader in the process
+        (keyed by path, mtime and size) and compiled to a marshal file in
+        cache_dir keyed by filename and content hash only, so restarts skip
+        YAML parsing until the file changes, even when a onefile build
+        unpacks the configs to a new temp folder on every launch. Treat the
+        result as read-only.
+        """
+        filepath = os.path.join(self.config_dir, filename)
+        try:
+            st = os.stat(filepath)
+        except OSError:
             print(f"Warning: {filepath} not found.")
             return {}
-            
-        with open(filepath, 'r') as f:
-            data = yaml.safe_load(f)
-            
-        if data and 'weapons' in data:
-            for weapon in data['weapons']:
-                self.weapons[weapon['id']] = weapon
-        return self.weapons
+        stamp = (st.st_mtime_ns, st.st_size)
+
+        cached = ConfigLoader._config_cache.get(filepath)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        compiled = self.read_compiled(filename)
+        if compiled is not None and compiled[0] == digest:
+            data = compiled[1]
+        else:
+            data = self.compile_config(yaml.load(raw, Loader=YamlLoader), section, filepath)
+            self.write_compiled(filename, (digest, data))
+
+        ConfigLoader._config_cache[filepath] = (stamp, data)
+        return data
+
+    @staticmethod
+    def compile_config(data, section, filepath):
+        """Validate parsed YAML and index its entries by id, skipping bad ones."""
+        entries = {}
+        if not data or section not in data:
+            return entries
+        for entry in data[section] or []:
+            if not isinstance(entry, dict) or 'id' not in entry:
+                print(f"Warning: skipping {section} entry without an id in {filepath}: {entry!r}")
+                continue
+            if entry['id'] in entries:
+                print(f"Warning: duplicate {section} id '{entry['id']}' in {filepath}")
+            entries[entry['id']] = entry
+        return entries
+
+    def compiled_path(self, filename):
+        return os.path.join(self.cache_dir, f"{filename}.marshal")
+
+    def read_compiled(self, filename):
+        """(sha256, config) from the compiled copy of filename, or None if missing or unusable.
+
+        marshal only rebuilds plain values (it never runs code from the file),
+        so a stale or planted file can at worst be rejected here.
+        """
+        try:
+            with open(self.compiled_path(filename), 'rb') as f:
+                compiled = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if (not isinstance(compiled, dict) or compiled.get('version') != CONFIG_CACHE_VERSION
+                or not isinstance(compiled.get('digest'), str) or not isinstance(compiled.get('data'), dict)):
+            return None
+        return compiled['digest'], compiled['data']
+
+    def write_compiled(self, filename, compiled):
+        digest, data = compiled
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write then rename so a concurrent reader never sees half a file
+            tmp_path = self.compiled_path(filename) + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                marshal.dump({'version': CONFIG_CACHE_VERSION, 'digest': digest, 'data': data}, f)
+            os.replace(tmp_path, self.compiled_path(filename))
+        except (OSError, ValueError) as e: # ValueError: a YAML value marshal can't store
+            print(f"Warning: could not write config cache for {filename}: {e}")
+
+    @staticmethod
+    def get_pack():
+        """The packed asset archive, or None if the game is running from loose files."""
+        if not ConfigLoader._pack_checked:
+            ConfigLoader._pack_checked = True
+            pack_path = ConfigLoader.get_resource_path(PACK_FILE)
+            if os.path.exists(pack_path):
+                try:
+                    ConfigLoader._pack = AssetPack(pack_path)
+                except (OSError, ValueError) as e:
+                    print(f"Error opening asset pack {pack_path}: {e}")
+        return ConfigLoader._pack
+
+    @staticmethod
+    def preload_images():
+        """Decode every packed sprite up front so the first spawn of each type doesn't hitch."""
+        pack = ConfigLoader.get_pack()
+        if pack is not None:
+            for path, size in pack.sprites():
+                ConfigLoader.load_image(path, size)
 
     @staticmethod
     def load_image(path, size=None):
@@ -66,6 +209,25 @@ class ConfigLoader:
         if cache_key in ConfigLoader._image_cache:
             return ConfigLoader._image_cache[cache_key]
             
+        # Pre-scaled copy from the asset pack, if one was built. A frozen build
+        # ships the pack with its sprites; in a checkout, an edited file wins.
+        pack = ConfigLoader.get_pack()
+        image = None
+        if pack is not None:
+            source_stamp = None
+            if not hasattr(sys, '_MEIPASS'):
+                try:
+                    st = os.stat(full_path)
+                    source_stamp = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    pass # Only the packed copy exists
+            image = pack.load(path, size, source_stamp)
+        if image is not None:
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
+            ConfigLoader._image_cache[cache_key] = image
+            return image
+            
         if not os.path.exists(full_path):
             # Try relative to CWD if not found in meipass (fallback)
             if os.path.exists(path):
@@ -74,7 +236,10 @@ class ConfigLoader:
                 return None
             
         try:
-            image = pygame.image.load(full_path).convert_alpha()
+            image = pygame.image.load(full_path)
+            # Display-format conversion needs a window (absent in headless runs)
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
             if size:
                 image = pygame.transform.scale(image, size)
             
@@ -84,6 +249,36 @@ class ConfigLoader:
             print(f"Error loading image {full_path}: {e}")
             return None
 
+    @staticmethod
+    def load_shape(shape, size, color, alpha=None):
+        """Procedural stand-in sprite, drawn once per (shape, size, color) and shared.
+
+        Callers must not draw on the returned surface. Shapes are converted to
+        display format when a window exists; transparent ones use an RLE
+        colorkey instead of per-pixel alpha, and alpha sets a surface alpha.
+        """
+        size = tuple(size)
+        color = tuple(color)
+        cache_key = ('shape', shape, size, color, alpha)
+        image = ConfigLoader._image_cache.get(cache_key)
+        if image is not None:
+            return image
+
+        draw, keyed = SHAPES[shape]
+        image = pygame.Surface(size)
+        if keyed:
+            image.fill(COLORKEY)
+        draw(image, color)
+        if pygame.display.get_surface() is not None:
+            image = image.convert()
+        if keyed:
+            image.set_colorkey(COLORKEY, pygame.RLEACCEL)
+        if alpha is not None:
+            image.set_alpha(alpha, pygame.RLEACCEL)
+
+        ConfigLoader._image_cache[cache_key] = image
+        return image
+
 # Simple test if run directly
 if __name__ == "__main__":
     loader = ConfigLoader()
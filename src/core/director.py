@@ -1,10 +1,21 @@
-import pygame
+from core.clock import GameClock
+from core.profiler import FRAME_BUDGET_MS, RECOVER_THRESHOLD
+
+MIN_LOAD_FACTOR = 0.3
+SHED_STEP = 0.8 # Load factor is multiplied by this each check while over budget
+RECOVER_STEP = 1.1 # ... and by this while comfortably under it
+SHED_GEM_CELL_LIMIT = 1 # While over budget, crowded gem cells are merged down to a single gem
 
 class Director:
-    def __init__(self, player, stats):
+    def __init__(self, player, stats, clock=None, profiler=None, entity_manager=None, frame_budget=FRAME_BUDGET_MS):
         self.player = player
+        self.clock = clock if clock is not None else GameClock()
         self.stats = stats
+        self.profiler = profiler
+        self.entity_manager = entity_manager
+        self.frame_budget = frame_budget
         self.difficulty_multiplier = 1.0
+        self.load_factor = 1.0 # Scales spawn rate and enemy cap; < 1 while shedding load
         self.last_check_time = 0
         self.check_interval = 5000 # Check every 5 seconds
         
@@ -13,9 +24,10 @@ class Director:
         self.last_damage = 0
         
     def update(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         if current_time - self.last_check_time > self.check_interval:
             self.adjust_difficulty()
+            self.shed_load()
             self.last_check_time = current_time
             
     def adjust_difficulty(self):
@@ -39,9 +51,25 @@ class Director:
         # Cap multiplier
         self.difficulty_multiplier = min(5.0, self.difficulty_multiplier)
 
+    def shed_load(self):
+        # Frame-time feedback: back off spawning while the p95 frame is over budget
+        if self.profiler is None:
+            return
+        p95 = self.profiler.frame_time_percentile(95)
+        if p95 is None:
+            return # Not enough frames yet (or a headless run)
+            
+        if p95 > self.frame_budget:
+            self.load_factor = max(MIN_LOAD_FACTOR, self.load_factor * SHED_STEP)
+            merged = self.entity_manager.merge_crowded_gems(limit=SHED_GEM_CELL_LIMIT) if self.entity_manager else 0
+            print(f"Director: p95 frame {p95:.1f}ms over {self.frame_budget:.1f}ms budget. Shedding load to {self.load_factor:.2f}, merged {merged} gems")
+        elif self.load_factor < 1.0 and p95 < self.frame_budget * RECOVER_THRESHOLD:
+            self.load_factor = min(1.0, self.load_factor * RECOVER_STEP)
+            print(f"Director: p95 frame {p95:.1f}ms under budget. Restoring load to {self.load_factor:.2f}")
+
     def get_spawn_rate_multiplier(self):
-        return self.difficulty_multiplier
+        return self.difficulty_multiplier * self.load_factor
 
     def get_enemy_cap_multiplier(self):
         # Increase cap slower than spawn rate
-        return 1.0 + (self.difficulty_multiplier - 1.0) * 0.5
+        return (1.0 + (self.difficulty_multiplier - 1.0) * 0.5) * self.load_factor
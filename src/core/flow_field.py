@@ -0,0 +1,139 @@
+import heapq
+import math
+from array import array
+
+SQRT2 = math.sqrt(2)
+NEIGHBOURS = (
+    (1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+    (1, 1, SQRT2), (1, -1, SQRT2), (-1, 1, SQRT2), (-1, -1, SQRT2),
+)
+
+class FlowField:
+    """Grid of steering directions towards a target, shared by the whole horde.
+
+    Covers a square of (2 * radius + 1) cells centred on the target's cell.
+    update() rebuilds it with one Dijkstra pass from the target, and only
+    when the target changes cell or the obstacles change, so per-enemy
+    steering is a single array lookup however large the crowd gets.
+
+    Cells with a clear straight line to the target are flagged in ``clear``;
+    enemies there steer straight at the target, which is exact, and the
+    stored directions only matter for routing around obstacles.
+    """
+
+    def __init__(self, cell_size=64, radius=14):
+        self.cell_size = cell_size
+        self.radius = radius
+        self.size = 2 * radius + 1
+        cells = self.size * self.size
+        self.dir_x = array('d', bytes(8 * cells))
+        self.dir_y = array('d', bytes(8 * cells))
+        self.clear = array('b', bytes(cells))
+        self.origin = None # Target cell the field was built for
+        self.blocked = set() # Impassable (cx, cy) cells
+        self.dirty = True
+        self.rebuilds = 0
+
+    def cell_for(self, pos):
+        return (int(pos[0] // self.cell_size), int(pos[1] // self.cell_size))
+
+    def add_obstacle(self, rect):
+        """Block every cell a world-space rect overlaps."""
+        size = self.cell_size
+        for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                self.blocked.add((cx, cy))
+        self.dirty = True
+
+    def clear_obstacles(self):
+        self.blocked.clear()
+        self.dirty = True
+
+    def index_of(self, x, y):
+        """Field index of the cell containing (x, y), or -1 outside the field."""
+        if self.origin is None:
+            return -1
+        col = int(x // self.cell_size) - self.origin[0] + self.radius
+        row = int(y // self.cell_size) - self.origin[1] + self.radius
+        if 0 <= col < self.size and 0 <= row < self.size:
+            return row * self.size + col
+        return -1
+
+    def update(self, target_pos):
+        """Recentre on target_pos if needed; returns True when the field was rebuilt."""
+        origin = self.cell_for(target_pos)
+        if origin == self.origin and not self.dirty:
+            return False
+        self.origin = origin
+        self.dirty = False
+        self.rebuilds += 1
+        if self.blocked:
+            self.build()
+        else:
+            # Open ground: every cell sees the target, no routing needed
+            self.clear[:] = array('b', b'\x01' * (self.size * self.size))
+        return True
+
+    def build(self):
+        size = self.size
+        radius = self.radius
+        ox, oy = self.origin
+        cells = size * size
+
+        # Passability of the field window, as a flat index -> 0/1 table
+        free = bytearray(b'\x01' * cells)
+        for cx, cy in self.blocked:
+            col = cx - ox + radius
+            row = cy - oy + radius
+            if 0 <= col < size and 0 <= row < size:
+                free[row * size + col] = 0
+
+        # Neighbour offsets as (flat offset, col step, row step, cost)
+        steps = [(dr * size + dc, dc, dr, cost) for dc, dr, cost in NEIGHBOURS]
+
+        # Dijkstra from the target cell over the free cells of the field. Each
+        # cell ends up pointing back at the neighbour it was reached from.
+        dir_x, dir_y = self.dir_x, self.dir_y
+        dir_x[:] = array('d', bytes(8 * cells))
+        dir_y[:] = array('d', bytes(8 * cells))
+        inf = math.inf
+        dist = [inf] * cells
+        start = radius * size + radius
+        dist[start] = 0.0
+        heap = [(0.0, start)]
+        heappop = heapq.heappop
+        heappush = heapq.heappush
+        while heap:
+            d, index = heappop(heap)
+            if d > dist[index]:
+                continue
+            row, col = divmod(index, size)
+            for offset, dc, dr, cost in steps:
+                c = col + dc
+                r = row + dr
+                if not (0 <= c < size and 0 <= r < size):
+                    continue
+                n = index + offset
+                # No cutting corners past an obstacle
+                if not free[n] or (dc and dr and not (free[index + dc] and free[index + dr * size])):
+                    continue
+                nd = d + cost
+                if nd < dist[n]:
+                    dist[n] = nd
+                    dir_x[n] = -dc / cost
+                    dir_y[n] = -dr / cost
+                    heappush(heap, (nd, n))
+
+        # Line of sight, ring by ring outwards: a cell sees the target if it is free
+        # and so is the cell one step back along its line towards the target
+        clear = self.clear
+        clear[start] = 1
+        for ring in range(1, radius + 1):
+            back = (ring - 1) / ring
+            edge = range(-ring, ring + 1)
+            perimeter = [(dc, dr) for dr in (-ring, ring) for dc in edge]
+            perimeter += [(dc, dr) for dc in (-ring, ring) for dr in edge[1:-1]]
+            for dc, dr in perimeter:
+                index = (dr + radius) * size + dc + radius
+                inner = (round(dr * back) + radius) * size + round(dc * back) + radius
+                clear[index] = 1 if free[index] and clear[inner] else 0
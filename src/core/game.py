@@ -1,20 +1,17 @@
 import pygame
 import sys
-from entities.player import Player
-from entities.spawner import Spawner
 from core.config_loader import ConfigLoader
-from content.weapon import WeaponController
 from core.camera import Camera
-from content.upgrades import UpgradeManager
-from content.particles import ParticleSystem
 from core.stats import GameStats
 from core.state_manager import StateManager
-from entities.entity_manager import EntityManager
 from core.profiler import Profiler
-from core.director import Director
+from core.clock import GameClock
+from core.world import World
+from core.background import Background
+from core.text import TextCache
 
 class Game:
-    def __init__(self):
+    def __init__(self, render_fps=60, frame_budget=None):
         pygame.init()
         self.SCREEN_WIDTH = 1280
         self.SCREEN_HEIGHT = 720
@@ -22,8 +19,14 @@ class Game:
         pygame.display.set_caption("Vampire Slopvivors")
         self.clock = pygame.time.Clock()
         
-        # Config
+        # Simulation runs in fixed steps of game time; rendering is capped separately (0 = uncapped)
+        self.game_clock = GameClock()
+        self.render_fps = render_fps
+        self.frame_budget = frame_budget # p95 frame time (ms) the Director sheds load to stay under
+        
+        # Config (packed sprites are decoded now, while the display format is known)
         self.config_loader = ConfigLoader()
+        ConfigLoader.preload_images()
         
         # Joystick
         pygame.joystick.init()
@@ -36,13 +39,21 @@ class Game:
             
         # Managers
         self.state_manager = StateManager()
-        self.stats = GameStats()
-        self.stats.start_ticks = pygame.time.get_ticks()
+        self.stats = GameStats(self.game_clock)
+        self.stats.start_ticks = self.game_clock.get_ticks()
         self.profiler = Profiler()
         
         # Camera
         self.camera = Camera(self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
         
+        # Ground (optional tiled art, otherwise the default grid)
+        self.background = Background(self.SCREEN_WIDTH, self.SCREEN_HEIGHT, ConfigLoader.load_image("assets/ground.png"))
+        
+        # HUD (top bar re-rendered only when its values change)
+        self.hud_surface = pygame.Surface((self.SCREEN_WIDTH, 80), pygame.SRCALPHA)
+        self.hud_key = None
+        self.overlays = {}
+        
         # Menu vars
         self.upgrade_options = []
         self.selected_upgrade_index = 0
@@ -53,45 +64,37 @@ class Game:
         self.init_game()
         
     def init_game(self):
-        # Player
-        self.player = Player((0, 0), joystick=self.active_joystick)
-        
-        # Entity Manager (Particle System set later to resolve circular dependency)
-        self.entity_manager = EntityManager(self.player, self.stats, None)
-        
-        # Particles
-        self.particle_system = ParticleSystem(self.entity_manager.all_sprites)
-        self.entity_manager.particle_system = self.particle_system
-        
-        # Weapon Controller
-        self.weapon_controller = WeaponController(self.player, self.entity_manager, self.config_loader, self.stats)
-        self.weapon_controller.add_weapon('whip')
-        self.weapon_controller.add_weapon('wand')
+        self.world = World(self.config_loader, self.game_clock, self.stats, self.profiler, joystick=self.active_joystick, frame_budget=self.frame_budget)
         
-        # Director
-        self.director = Director(self.player, self.stats)
-        
-        # Spawner
-        self.spawner = Spawner(self.config_loader, self.player, self.entity_manager, self.director)
-        
-        # Upgrades
-        self.upgrade_manager = UpgradeManager(self.player, self.weapon_controller)
+        # Shortcuts used by rendering, menus and debug keys
+        self.player = self.world.player
+        self.entity_manager = self.world.entity_manager
+        self.spawner = self.world.spawner
+        self.upgrade_manager = self.world.upgrade_manager
         
         self.state_manager.change_state("PLAYING")
 
     def reset_game(self):
         self.stats.reset()
-        self.stats.start_ticks = pygame.time.get_ticks()
+        self.game_clock.reset()
+        self.game_clock.resume()
+        self.stats.start_ticks = self.game_clock.get_ticks()
         self.camera = Camera(self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
         self.init_game()
 
     def run(self):
         self.running = True
+        self.clock.tick()
         while self.running:
+            frame_time = self.clock.tick(self.render_fps)
+            # The budget is about the work a frame costs: leave out the sleep tick() adds to cap the FPS
+            self.profiler.update(self.clock.get_rawtime())
             self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(60)
+            
+            # Catch the simulation up in fixed steps, then draw in between the last two
+            for _ in range(self.game_clock.advance(frame_time)):
+                self.update()
+            self.draw(self.game_clock.alpha)
         pygame.quit()
         sys.exit()
 
@@ -111,10 +114,7 @@ class Game:
             # Pause Toggle
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE or event.key == pygame.K_p:
-                    if self.state_manager.is_state("PLAYING"):
-                        self.state_manager.change_state("PAUSED")
-                    elif self.state_manager.is_state("PAUSED"):
-                        self.state_manager.change_state("PLAYING")
+                    self.toggle_pause()
                 
                 elif event.key == pygame.K_F3:
                     self.profiler.toggle()
@@ -133,14 +133,20 @@ class Game:
             
             elif event.type == pygame.JOYBUTTONDOWN:
                 if event.button in [7, 9]: 
-                    if self.state_manager.is_state("PLAYING"):
-                        self.state_manager.change_state("PAUSED")
-                    elif self.state_manager.is_state("PAUSED"):
-                        self.state_manager.change_state("PLAYING")
+                    self.toggle_pause()
 
             if self.state_manager.is_state("LEVEL_UP"):
                 self.handle_levelup_input(event)
 
+    def toggle_pause(self):
+        # Freezing the game clock keeps spawn timers, cooldowns and lifetimes intact
+        if self.state_manager.is_state("PLAYING"):
+            self.state_manager.change_state("PAUSED")
+            self.game_clock.pause()
+        elif self.state_manager.is_state("PAUSED"):
+            self.state_manager.change_state("PLAYING")
+            self.game_clock.resume()
+
     def handle_levelup_input(self, event):
         choice = -1
         if event.type == pygame.KEYDOWN:
@@ -163,39 +169,19 @@ class Game:
             self.state_manager.change_state("PLAYING")
 
     def update(self):
-        self.profiler.update()
+        # Start of a simulation step: remember positions for render interpolation
+        self.entity_manager.snapshot_positions()
+        self.camera.snapshot()
         
         if self.state_manager.is_state("PLAYING"):
-            self.profiler.start("update")
-            self.director.update()
-            self.spawner.update()
-            self.weapon_controller.update()
-            self.particle_system.update()
-            self.entity_manager.update()
+            # Game time only advances while actually playing (not in menus)
+            new_state = self.world.step()
             self.camera.update(self.player)
-            self.profiler.stop("update")
             
-            # Check Game Over
-            if self.entity_manager.check_player_collisions():
-                self.state_manager.change_state("GAME_OVER")
-                self.stats.end_ticks = pygame.time.get_ticks()
-                print("Game Over")
-
-            # Check Victory (15 Minutes)
-            if self.stats.get_time_survived() >= 900: # 15 mins
-                self.state_manager.change_state("VICTORY")
-                self.stats.end_ticks = pygame.time.get_ticks()
-                print("Victory!")
-
-            # Check Level Up (Gems)
-            if self.entity_manager.check_gem_collisions():
-                self.state_manager.change_state("LEVEL_UP")
-                self.upgrade_options = self.upgrade_manager.get_options()
-
-            # Check Chests
-            if self.entity_manager.check_chest_collisions():
-                self.state_manager.change_state("LEVEL_UP")
-                self.upgrade_options = self.upgrade_manager.get_options(5)
+            if new_state is not None:
+                self.state_manager.change_state(new_state)
+                if new_state == "LEVEL_UP":
+                    self.upgrade_options = self.world.upgrade_options
 
         elif self.state_manager.is_state("LEVEL_UP"):
             # Continuous input for menu
@@ -216,105 +202,60 @@ class Game:
                             self.selected_upgrade_index += 1
                             self.menu_input_timer = current_time
 
-    def draw(self):
-        self.screen.fill((30, 30, 30))
-        
-        # Grid
-        grid_size = 64
-        start_x = (self.camera.camera.x % grid_size)
-        start_y = (self.camera.camera.y % grid_size)
-        
-        for x in range(start_x, self.SCREEN_WIDTH, grid_size):
-            pygame.draw.line(self.screen, (40, 40, 40), (x, 0), (x, self.SCREEN_HEIGHT))
-        for y in range(start_y, self.SCREEN_HEIGHT, grid_size):
-            pygame.draw.line(self.screen, (40, 40, 40), (0, y), (self.SCREEN_WIDTH, y))
+    def draw(self, alpha=1.0):
+        # Ground
+        self.background.draw(self.screen, self.camera, alpha)
 
         # Entities
-        self.entity_manager.draw(self.screen, self.camera)
+        self.entity_manager.draw(self.screen, self.camera, alpha)
+        self.world.particle_system.draw(self.screen, self.camera, alpha)
+        self.profiler.set_counter("sprites drawn", self.entity_manager.drawn_count)
+        self.profiler.set_counter("sprites culled", self.entity_manager.culled_count)
+        
+        # Debug: enemy spatial hash occupancy
+        self.profiler.draw_spatial_hash(self.screen, self.camera, self.entity_manager.enemy_grid)
         
         # UI
         self.draw_hud()
         
+    def get_overlay(self, color):
+        # Full-screen translucent overlays are built once per colour
+        overlay = self.overlays.get(color)
+        if overlay is None:
+            overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+            overlay.fill(color)
+            self.overlays[color] = overlay
+        return overlay
+
     def draw_hud(self):
-        # Top Bar Background
-        pygame.draw.rect(self.screen, (20, 20, 20), (0, 0, self.SCREEN_WIDTH, 60))
-        pygame.draw.line(self.screen, (100, 100, 100), (0, 60), (self.SCREEN_WIDTH, 60), 2)
-        
-        font = pygame.font.SysFont(None, 24)
-        font_large = pygame.font.SysFont(None, 36)
-        
-        # HP Bar (Top Left)
-        hp_pct = max(0, self.player.hp / self.player.max_hp)
-        bar_width = 200
-        bar_height = 20
-        x = 20
-        y = 10
-        
-        # Background
-        pygame.draw.rect(self.screen, (50, 0, 0), (x, y, bar_width, bar_height))
-        # Foreground
-        pygame.draw.rect(self.screen, (200, 0, 0), (x, y, int(bar_width * hp_pct), bar_height))
-        # Border
-        pygame.draw.rect(self.screen, (255, 255, 255), (x, y, bar_width, bar_height), 2)
-        
-        hp_text = font.render(f"{int(self.player.hp)} / {self.player.max_hp}", True, (255, 255, 255))
-        self.screen.blit(hp_text, (x + bar_width + 10, y + 2))
-        
-        # XP Bar (Below HP)
-        xp_pct = max(0, self.player.xp / self.player.next_level_xp)
-        y += 25
-        
-        # Background
-        pygame.draw.rect(self.screen, (0, 0, 50), (x, y, bar_width, bar_height))
-        # Foreground
-        pygame.draw.rect(self.screen, (0, 100, 255), (x, y, int(bar_width * xp_pct), bar_height))
-        # Border
-        pygame.draw.rect(self.screen, (255, 255, 255), (x, y, bar_width, bar_height), 2)
-        
-        lvl_text = font.render(f"LVL {self.player.level}", True, (255, 255, 0))
-        self.screen.blit(lvl_text, (x + bar_width + 10, y + 2))
-        
-        # Timer (Top Center)
+        # The top bar is cached and only re-rendered when a value it shows changes
         time_survived = self.stats.get_time_survived()
-        minutes = int(time_survived // 60)
-        seconds = int(time_survived % 60)
-        timer_text = font_large.render(f"{minutes:02d}:{seconds:02d}", True, (255, 255, 255))
-        self.screen.blit(timer_text, (self.SCREEN_WIDTH // 2 - timer_text.get_width() // 2, 15))
-        
-        # Kills (Top Right)
-        kills_text = font_large.render(f"Kills: {self.stats.enemies_killed}", True, (255, 200, 200))
-        self.screen.blit(kills_text, (self.SCREEN_WIDTH - kills_text.get_width() - 20, 15))
+        hud_key = (
+            self.player.hp, self.player.max_hp, self.player.xp, self.player.next_level_xp,
+            self.player.level, int(time_survived), self.stats.enemies_killed, self.player.invincible
+        )
+        if hud_key != self.hud_key:
+            self.hud_key = hud_key
+            self.render_top_bar(time_survived)
+        self.screen.blit(self.hud_surface, (0, 0))
         
         self.profiler.draw(self.screen)
         
-        if self.player.invincible:
-            inv_text = font.render("INVINCIBLE", True, (255, 255, 0))
-            self.screen.blit(inv_text, (self.SCREEN_WIDTH // 2 - inv_text.get_width() // 2, 50))
-        
         if self.state_manager.is_state("LEVEL_UP"):
             self.upgrade_manager.draw_menu(self.screen, self.upgrade_options, self.selected_upgrade_index)
         
         if self.state_manager.is_state("PAUSED"):
-            overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 150))
-            self.screen.blit(overlay, (0, 0))
+            self.screen.blit(self.get_overlay((0, 0, 0, 150)), (0, 0))
             
-            font_title = pygame.font.SysFont(None, 64)
-            title = font_title.render("PAUSED", True, (255, 255, 255))
+            title = TextCache.render("PAUSED", 64, (255, 255, 255))
             self.screen.blit(title, (self.screen.get_width()//2 - title.get_width()//2, self.screen.get_height()//2))
             
         if self.state_manager.is_state("GAME_OVER"):
-            overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
-            overlay.fill((50, 0, 0, 230))
-            self.screen.blit(overlay, (0, 0))
+            self.screen.blit(self.get_overlay((50, 0, 0, 230)), (0, 0))
             
-            font_title = pygame.font.SysFont(None, 64)
-            font_stats = pygame.font.SysFont(None, 32)
-            
-            title = font_title.render("GAME OVER", True, (255, 0, 0))
+            title = TextCache.render("GAME OVER", 64, (255, 0, 0))
             self.screen.blit(title, (self.screen.get_width()//2 - title.get_width()//2, 100))
             
-            time_survived = self.stats.get_time_survived()
             lines = [
                 f"Time Survived: {int(time_survived//60)}:{int(time_survived%60):02d}",
                 f"Enemies Killed: {self.stats.enemies_killed}",
@@ -322,44 +263,85 @@ class Game:
                 f"Shots Fired: {self.stats.shots_fired}",
                 f"Level Reached: {self.player.level}"
             ]
-            
-            y = 200
-            for line in lines:
-                text = font_stats.render(line, True, (255, 255, 255))
-                self.screen.blit(text, (self.screen.get_width()//2 - text.get_width()//2, y))
-                y += 40
-                
-            y += 50
-            restart_text = font_stats.render("Press R or Button A to Restart", True, (255, 255, 0))
-            self.screen.blit(restart_text, (self.screen.get_width()//2 - restart_text.get_width()//2, y))
+            self.draw_summary(lines)
             
         if self.state_manager.is_state("VICTORY"):
-            overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
-            overlay.fill((0, 50, 0, 230))
-            self.screen.blit(overlay, (0, 0))
-            
-            font_title = pygame.font.SysFont(None, 64)
-            font_stats = pygame.font.SysFont(None, 32)
+            self.screen.blit(self.get_overlay((0, 50, 0, 230)), (0, 0))
             
-            title = font_title.render("VICTORY!", True, (255, 255, 0))
+            title = TextCache.render("VICTORY!", 64, (255, 255, 0))
             self.screen.blit(title, (self.screen.get_width()//2 - title.get_width()//2, 100))
             
-            time_survived = self.stats.get_time_survived()
             lines = [
                 f"Time Survived: {int(time_survived//60)}:{int(time_survived%60):02d}",
                 f"Enemies Killed: {self.stats.enemies_killed}",
                 f"Damage Dealt: {self.stats.damage_dealt}",
                 f"Level Reached: {self.player.level}"
             ]
-            
-            y = 200
-            for line in lines:
-                text = font_stats.render(line, True, (255, 255, 255))
-                self.screen.blit(text, (self.screen.get_width()//2 - text.get_width()//2, y))
-                y += 40
-                
-            y += 50
-            restart_text = font_stats.render("Press R or Button A to Restart", True, (255, 255, 0))
-            self.screen.blit(restart_text, (self.screen.get_width()//2 - restart_text.get_width()//2, y))
+            self.draw_summary(lines)
         
         pygame.display.flip()
+
+    def draw_summary(self, lines):
+        # End-of-run stats and restart hint (Game Over / Victory screens)
+        y = 200
+        for line in lines:
+            text = TextCache.render(line, 32, (255, 255, 255))
+            self.screen.blit(text, (self.screen.get_width()//2 - text.get_width()//2, y))
+            y += 40
+            
+        y += 50
+        restart_text = TextCache.render("Press R or Button A to Restart", 32, (255, 255, 0))
+        self.screen.blit(restart_text, (self.screen.get_width()//2 - restart_text.get_width()//2, y))
+
+    def render_top_bar(self, time_survived):
+        surface = self.hud_surface
+        surface.fill((0, 0, 0, 0))
+        
+        # Top Bar Background
+        pygame.draw.rect(surface, (20, 20, 20), (0, 0, self.SCREEN_WIDTH, 60))
+        pygame.draw.line(surface, (100, 100, 100), (0, 60), (self.SCREEN_WIDTH, 60), 2)
+        
+        # HP Bar (Top Left)
+        hp_pct = max(0, self.player.hp / self.player.max_hp)
+        bar_width = 200
+        bar_height = 20
+        x = 20
+        y = 10
+        
+        # Background
+        pygame.draw.rect(surface, (50, 0, 0), (x, y, bar_width, bar_height))
+        # Foreground
+        pygame.draw.rect(surface, (200, 0, 0), (x, y, int(bar_width * hp_pct), bar_height))
+        # Border
+        pygame.draw.rect(surface, (255, 255, 255), (x, y, bar_width, bar_height), 2)
+        
+        hp_text = TextCache.render(f"{int(self.player.hp)} / {self.player.max_hp}", 24, (255, 255, 255))
+        surface.blit(hp_text, (x + bar_width + 10, y + 2))
+        
+        # XP Bar (Below HP)
+        xp_pct = max(0, self.player.xp / self.player.next_level_xp)
+        y += 25
+        
+        # Background
+        pygame.draw.rect(surface, (0, 0, 50), (x, y, bar_width, bar_height))
+        # Foreground
+        pygame.draw.rect(surface, (0, 100, 255), (x, y, int(bar_width * xp_pct), bar_height))
+        # Border
+        pygame.draw.rect(surface, (255, 255, 255), (x, y, bar_width, bar_height), 2)
+        
+        lvl_text = TextCache.render(f"LVL {self.player.level}", 24, (255, 255, 0))
+        surface.blit(lvl_text, (x + bar_width + 10, y + 2))
+        
+        # Timer (Top Center)
+        minutes = int(time_survived // 60)
+        seconds = int(time_survived % 60)
+        timer_text = TextCache.render(f"{minutes:02d}:{seconds:02d}", 36, (255, 255, 255))
+        surface.blit(timer_text, (self.SCREEN_WIDTH // 2 - timer_text.get_width() // 2, 15))
+        
+        # Kills (Top Right)
+        kills_text = TextCache.render(f"Kills: {self.stats.enemies_killed}", 36, (255, 200, 200))
+        surface.blit(kills_text, (self.SCREEN_WIDTH - kills_text.get_width() - 20, 15))
+        
+        if self.player.invincible:
+            inv_text = TextCache.render("INVINCIBLE", 24, (255, 255, 0))
+            surface.blit(inv_text, (self.SCREEN_WIDTH // 2 - inv_text.get_width() // 2, 50))
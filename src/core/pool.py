@@ -0,0 +1,42 @@
+DEFAULT_POOL_CAPS = {
+    'projectile': 256,
+    'enemy_projectile': 256,
+    'axe': 64,
+    'gem': 2048,
+}
+
+class ObjectPool:
+    """Free list of retired sprites of one class, recycled through reset().
+
+    acquire() takes the same arguments as the class constructor. Pooled
+    classes call pool.release(self) when they die; at most cap instances
+    are kept, anything beyond that is left to the garbage collector.
+    """
+
+    def __init__(self, cls, cap):
+        self.cls = cls
+        self.cap = cap
+        self.free = []
+        self.hits = 0
+        self.misses = 0
+        self.on_acquire = None # Optional callback(obj) for owners that cache per-sprite state
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.hits += 1
+        else:
+            obj = self.cls(*args, **kwargs)
+            obj.pool = self
+            self.misses += 1
+        if self.on_acquire is not None:
+            self.on_acquire(obj)
+        return obj
+
+    def release(self, obj):
+        if len(self.free) < self.cap:
+            self.free.append(obj)
+
+    def stats(self):
+        return f"{self.hits} hit / {self.misses} miss / {len(self.free)} free"
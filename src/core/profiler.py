@@ -1,5 +1,14 @@
+import math
 import pygame
 import time
+from collections import deque
+from core.text import TextCache
+
+FRAME_WINDOW = 240 # Frames of history kept for frame-time percentiles (~4 s at 60 FPS)
+
+# Shared by everything that backs off when frames run long (Director, EffectsQuality)
+FRAME_BUDGET_MS = 20.0 # p95 frame time above which load is shed
+RECOVER_THRESHOLD = 0.75 # Fraction of the budget p95 must drop below to recover
 
 class Profiler:
     def __init__(self):
@@ -10,6 +19,8 @@ class Profiler:
         self.frame_time = 0
         self.timers = {}
         self.start_times = {}
+        self.counters = {}
+        self.frame_times = deque(maxlen=FRAME_WINDOW) # ms of work per frame (no frame-cap sleep), recorded even while disabled
 
     def toggle(self):
         self.enabled = not self.enabled
@@ -25,7 +36,14 @@ class Profiler:
             duration = (time.perf_counter() - self.start_times[name]) * 1000 # ms
             self.timers[name] = duration
 
-    def update(self):
+    def set_counter(self, name, value):
+        if not self.enabled: return
+        self.counters[name] = value
+
+    def update(self, frame_time=None):
+        if frame_time is not None:
+            self.frame_times.append(frame_time)
+        
         self.frame_count += 1
         current_time = time.time()
         if current_time - self.last_time >= 1.0:
@@ -36,10 +54,25 @@ class Profiler:
         # Calculate frame time (approx)
         self.frame_time = 1000.0 / max(1, self.fps) if self.fps > 0 else 0
 
+    def frame_time_percentile(self, percentile, min_samples=60, window=None):
+        """Frame time (ms) under which percentile% of recent frames finished, or None without enough samples.
+
+        window limits the sample to the most recent frames.
+        """
+        frame_times = self.frame_times
+        if window is not None and window < len(frame_times):
+            frame_times = list(frame_times)[-window:]
+        if len(frame_times) < min_samples:
+            return None
+        ordered = sorted(frame_times)
+        index = max(0, math.ceil(percentile / 100 * len(ordered)) - 1)
+        return ordered[index]
+
     def draw(self, screen):
         if not self.enabled: return
         
-        font = pygame.font.SysFont("Consolas", 16)
+        # Values change every frame, so use the shared font but skip the text cache
+        font = TextCache.font(16, "Consolas")
         y = 80
         
         # Draw FPS and Frame Time
@@ -55,5 +88,32 @@ class Profiler:
             screen.blit(text, (10, y))
             y += 20
             
-        # Entity Count (if available via game reference, or just generic)
-        # We can add custom debug info here later
+        # Counters (entity counts, index stats, ...)
+        for name, value in self.counters.items():
+            text = font.render(f"{name}: {value}", True, (200, 200, 255))
+            screen.blit(text, (10, y))
+            y += 20
+
+    def draw_spatial_hash(self, screen, camera, spatial_hash):
+        """Overlay occupied grid cells, shaded by how many sprites they hold."""
+        if not self.enabled: return
+        
+        size = spatial_hash.cell_size
+        occupancy = spatial_hash.occupancy()
+        view = pygame.Rect(-camera.camera.x, -camera.camera.y, camera.width, camera.height)
+        
+        overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+        for (cx, cy), count in occupancy.items():
+            cell_rect = pygame.Rect(cx * size, cy * size, size, size)
+            if not view.colliderect(cell_rect):
+                continue
+            # Green for sparse cells, red for crowded ones
+            heat = min(1.0, count / 8.0)
+            color = (int(255 * heat), int(255 * (1 - heat)), 0)
+            screen_rect = camera.apply_rect(cell_rect)
+            overlay.fill((*color, 60), screen_rect)
+            pygame.draw.rect(overlay, (*color, 160), screen_rect, 1)
+        screen.blit(overlay, (0, 0))
+        
+        self.set_counter("grid cells", len(occupancy))
+        self.set_counter("grid max/cell", max(occupancy.values(), default=0))
@@ -0,0 +1,164 @@
+import heapq
+import itertools
+
+class SpatialHash:
+    """Uniform grid that buckets sprites by the cell containing their centre.
+
+    Entries are kept in sync incrementally: moving a sprite only touches the
+    hash when it crosses a cell boundary, and a radius query only visits the
+    cells it overlaps instead of every sprite in the world.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy) -> {sprite: insertion number}, in insertion order
+        self.sprite_cells = {}  # sprite -> (cx, cy)
+        self.sequence = itertools.count() # Insertion numbers; nearest() breaks distance ties on them
+
+    def __len__(self):
+        return len(self.sprite_cells)
+
+    def __contains__(self, sprite):
+        return sprite in self.sprite_cells
+
+    def cell_for(self, pos):
+        return (int(pos[0] // self.cell_size), int(pos[1] // self.cell_size))
+
+    def insert(self, sprite, pos):
+        cell = self.cell_for(pos)
+        self.sprite_cells[sprite] = cell
+        bucket = self.cells.get(cell)
+        if bucket is None:
+            bucket = self.cells[cell] = {}
+        bucket[sprite] = next(self.sequence)
+
+    def remove(self, sprite):
+        cell = self.sprite_cells.pop(sprite, None)
+        if cell is None:
+            return
+        bucket = self.cells[cell]
+        bucket.pop(sprite, None)
+        if not bucket:
+            del self.cells[cell]
+
+    def move(self, sprite, pos):
+        cell = self.cell_for(pos)
+        old_cell = self.sprite_cells.get(sprite)
+        if cell == old_cell:
+            return
+        if old_cell is not None:
+            self.remove(sprite)
+        self.insert(sprite, pos)
+
+    def clear(self):
+        self.cells.clear()
+        self.sprite_cells.clear()
+
+    def pop_cell(self, cell):
+        """Remove and return every sprite in one cell, in insertion order."""
+        bucket = self.cells.pop(cell, None)
+        if bucket is None:
+            return []
+        sprite_cells = self.sprite_cells
+        for sprite in bucket:
+            del sprite_cells[sprite]
+        return list(bucket)
+
+    def query_radius(self, pos, radius):
+        """Return sprites in every cell overlapping the circle (a superset of the hits)."""
+        size = self.cell_size
+        min_cx = int((pos[0] - radius) // size)
+        max_cx = int((pos[0] + radius) // size)
+        min_cy = int((pos[1] - radius) // size)
+        max_cy = int((pos[1] + radius) // size)
+
+        cells = self.cells
+        result = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    result.extend(bucket)
+        return result
+
+    def query_rect(self, rect, margin=0):
+        """Return sprites whose centre cell overlaps rect grown by margin on every side."""
+        size = self.cell_size
+        min_cx = int((rect.left - margin) // size)
+        max_cx = int((rect.right + margin) // size)
+        min_cy = int((rect.top - margin) // size)
+        max_cy = int((rect.bottom + margin) // size)
+
+        cells = self.cells
+        result = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    result.extend(bucket)
+        return result
+
+    def nearest(self, pos, k=1, predicate=None):
+        """Return up to k distinct sprites closest to pos (by rect centre), nearest first.
+
+        Cells are visited in square rings around pos; the search stops once
+        the next ring cannot contain anything closer than the current k-th
+        best. Sprites failing predicate are skipped.
+        """
+        if k <= 0 or not self.sprite_cells:
+            return []
+        
+        px, py = pos
+        size = self.cell_size
+        ccx, ccy = self.cell_for(pos)
+        cells = self.cells
+        best = [] # max-heap of (-dist_sq, -insertion number, sprite), at most k entries
+        
+        def consider(bucket):
+            for sprite, number in bucket.items():
+                if predicate is not None and not predicate(sprite):
+                    continue
+                sx, sy = sprite.rect.center
+                dist_sq = (sx - px) ** 2 + (sy - py) ** 2
+                entry = (-dist_sq, -number, sprite) # Ties go to the earlier insert
+                if len(best) < k:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
+        
+        remaining = len(cells)
+        r = 0
+        while remaining > 0:
+            if len(best) == k:
+                # Anything in ring r is at least (r - 1) cells away
+                bound = (r - 1) * size
+                if bound > 0 and bound * bound > -best[0][0]:
+                    break
+            
+            ring_size = 8 * r if r else 1
+            if ring_size > remaining:
+                # Sparse far-away leftovers: cheaper to scan the occupied cells directly
+                for (cx, cy), bucket in cells.items():
+                    if max(abs(cx - ccx), abs(cy - ccy)) >= r:
+                        consider(bucket)
+                break
+            
+            for cx in range(ccx - r, ccx + r + 1):
+                # Top and bottom rows of the ring, plus its left/right columns
+                if cx == ccx - r or cx == ccx + r:
+                    cys = range(ccy - r, ccy + r + 1)
+                else:
+                    cys = (ccy - r, ccy + r) if r else (ccy,)
+                for cy in cys:
+                    bucket = cells.get((cx, cy))
+                    if bucket:
+                        remaining -= 1
+                        consider(bucket)
+            r += 1
+        
+        best.sort(reverse=True)
+        return [sprite for _, _, sprite in best]
+
+    def occupancy(self):
+        """Return {cell: count} for every non-empty cell (used by the debug overlay)."""
+        return {cell: len(bucket) for cell, bucket in self.cells.items()}
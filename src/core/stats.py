@@ -1,5 +1,8 @@
+from core.clock import GameClock
+
 class GameStats:
-    def __init__(self):
+    def __init__(self, clock=None):
+        self.clock = clock if clock is not None else GameClock()
         self.reset()
 
     def reset(self):
@@ -10,8 +13,7 @@ class GameStats:
         self.end_ticks = 0
         
     def get_time_survived(self):
-        # Returns seconds
-        import pygame
-        current = self.end_ticks if self.end_ticks > 0 else pygame.time.get_ticks()
+        # Returns seconds of game time
+        current = self.end_ticks if self.end_ticks > 0 else self.clock.get_ticks()
         duration = current - self.start_ticks
         return duration / 1000.0
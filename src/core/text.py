@@ -0,0 +1,39 @@
+from collections import OrderedDict
+import pygame
+
+class TextCache:
+    """Shared font registry and rendered-text cache.
+
+    Each (name, size) font is looked up once. Rendered surfaces are cached
+    by (font, text, color) with least-recently-used eviction, so labels
+    that don't change cost a dict lookup instead of a render.
+    """
+    _fonts = {}
+    _surfaces = OrderedDict()
+    max_surfaces = 512
+
+    @staticmethod
+    def font(size, name=None):
+        key = (name, size)
+        font = TextCache._fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = pygame.font.SysFont(name, size)
+            TextCache._fonts[key] = font
+        return font
+
+    @staticmethod
+    def render(text, size, color, name=None):
+        key = (name, size, text, tuple(color))
+        surfaces = TextCache._surfaces
+        surface = surfaces.get(key)
+        if surface is not None:
+            surfaces.move_to_end(key)
+            return surface
+
+        surface = TextCache.font(size, name).render(text, True, color)
+        surfaces[key] = surface
+        if len(surfaces) > TextCache.max_surfaces:
+            surfaces.popitem(last=False)
+        return surface
@@ -0,0 +1,64 @@
+import heapq
+import itertools
+
+class Timer:
+    """Handle for a scheduled callback; cancel() stops it from firing."""
+    __slots__ = ('queue', 'due', 'callback', 'args', 'pending')
+
+    def __init__(self, queue, due, callback, args):
+        self.queue = queue
+        self.due = due
+        self.callback = callback
+        self.args = args
+        self.pending = True
+
+    def cancel(self):
+        if self.pending:
+            self.pending = False
+            self.callback = self.args = None # Don't keep dead sprites alive until the due time
+            self.queue.cancelled += 1
+
+class TimerQueue:
+    """Min-heap of callbacks keyed by game-time deadline.
+
+    run_due() only touches timers that have come due, so lifetimes and
+    cooldowns cost O(expired) per step instead of a check per live entity.
+    Cancelled timers are dropped lazily, and the heap is compacted when
+    they make up most of it.
+    """
+
+    def __init__(self):
+        self.heap = [] # (due, sequence, Timer); sequence keeps equal deadlines in schedule order
+        self.sequence = itertools.count()
+        self.cancelled = 0
+
+    def __len__(self):
+        return len(self.heap) - self.cancelled
+
+    def schedule(self, due, callback, *args):
+        timer = Timer(self, due, callback, args)
+        heapq.heappush(self.heap, (due, next(self.sequence), timer))
+        if self.cancelled > 64 and self.cancelled * 2 > len(self.heap):
+            self.compact()
+        return timer
+
+    def run_due(self, now):
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            timer = heapq.heappop(heap)[2]
+            if not timer.pending:
+                self.cancelled -= 1
+                continue
+            timer.pending = False
+            timer.callback(*timer.args)
+
+    def compact(self):
+        self.heap = [entry for entry in self.heap if entry[2].pending]
+        heapq.heapify(self.heap)
+        self.cancelled = 0
+
+    def clear(self):
+        for _, _, timer in self.heap:
+            timer.pending = False
+        self.heap.clear()
+        self.cancelled = 0
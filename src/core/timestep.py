@@ -0,0 +1,27 @@
+FIXED_DT = 1000 / 60 # ms of simulation advanced by one update step
+MAX_FRAME_TIME = 250 # ms; longer hitches are dropped instead of replayed
+
+class FixedTimestep:
+    """Accumulator that turns variable render frame times into fixed simulation steps.
+
+    advance() returns how many fixed steps the simulation owes after a frame;
+    alpha is the fraction of a step left over, used to interpolate drawing
+    between the previous and current simulation state.
+    """
+
+    def __init__(self, dt=FIXED_DT, max_frame_time=MAX_FRAME_TIME):
+        self.dt = dt
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
+
+    def advance(self, frame_time, scale=1.0):
+        # Clamp the real frame time, then scale it, so a hitch is dropped
+        # but fast-forward can still run far more than max_frame_time of game time
+        self.accumulator += min(frame_time, self.max_frame_time) * scale
+        steps = int(self.accumulator // self.dt)
+        self.accumulator -= steps * self.dt
+        return steps
+
+    @property
+    def alpha(self):
+        return self.accumulator / self.dt
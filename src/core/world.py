@@ -0,0 +1,138 @@
+import random
+from entities.player import Player
+from entities.spawner import Spawner
+from entities.entity_manager import EntityManager
+from entities.horde import LOD_TIERS
+from content.weapon import WeaponController
+from content.upgrades import UpgradeManager
+from content.particles import ParticleSystem, EffectsQuality
+from core.config_loader import ConfigLoader
+from core.clock import GameClock
+from core.stats import GameStats
+from core.profiler import Profiler, FRAME_BUDGET_MS
+from core.director import Director
+
+VICTORY_TIME = 900 # seconds (15 minutes)
+
+class World:
+    """The gameplay simulation with no display, fonts or input polling.
+
+    Owns the player and every gameplay system for one run. Game wraps a
+    World with rendering and menus; headless runs drive it directly.
+    """
+
+    def __init__(self, config_loader, clock=None, stats=None, profiler=None, joystick=None, player_input=True, frame_budget=None):
+        self.config_loader = config_loader
+        self.clock = clock if clock is not None else GameClock()
+        self.stats = stats if stats is not None else GameStats(self.clock)
+        self.profiler = profiler if profiler is not None else Profiler()
+        self.upgrade_options = []
+
+        # Player
+        self.player = Player((0, 0), joystick=joystick, clock=self.clock)
+        self.player.input_enabled = player_input
+
+        # Entity Manager (Particle System set later to resolve circular dependency)
+        self.entity_manager = EntityManager(self.player, self.stats, None, self.clock)
+
+        # Particles
+        self.particle_system = ParticleSystem(self.clock)
+        self.entity_manager.particle_system = self.particle_system
+
+        # Weapon Controller
+        self.weapon_controller = WeaponController(self.player, self.entity_manager, self.config_loader, self.stats, self.clock)
+        self.weapon_controller.add_weapon('whip')
+        self.weapon_controller.add_weapon('wand')
+
+        # Director and effects quality (shed load when the Profiler's frame times go over budget)
+        if frame_budget is None:
+            frame_budget = FRAME_BUDGET_MS
+        self.director = Director(self.player, self.stats, self.clock, self.profiler, self.entity_manager, frame_budget)
+        self.effects_quality = EffectsQuality(self.particle_system, self.profiler, self.clock, frame_budget)
+
+        # Spawner
+        self.spawner = Spawner(self.config_loader, self.player, self.entity_manager, self.director, self.clock)
+
+        # Upgrades
+        self.upgrade_manager = UpgradeManager(self.player, self.weapon_controller)
+
+    def step(self):
+        """Advance one fixed simulation step.
+
+        Returns the state the game should switch to ("GAME_OVER", "VICTORY"
+        or "LEVEL_UP", with upgrade_options filled in), or None to keep playing.
+        """
+        self.clock.step()
+
+        self.profiler.start("update")
+        self.director.update()
+        self.effects_quality.update()
+        self.spawner.update()
+        self.weapon_controller.update()
+        self.particle_system.update()
+        self.entity_manager.update()
+        self.profiler.stop("update")
+
+        new_state = None
+
+        # Check Game Over
+        if self.entity_manager.check_player_collisions():
+            new_state = "GAME_OVER"
+            self.stats.end_ticks = self.clock.get_ticks()
+            print("Game Over")
+
+        # Check Victory (15 Minutes)
+        if self.stats.get_time_survived() >= VICTORY_TIME:
+            new_state = "VICTORY"
+            self.stats.end_ticks = self.clock.get_ticks()
+            print("Victory!")
+
+        # Check Level Up (Gems)
+        if self.entity_manager.check_gem_collisions():
+            new_state = "LEVEL_UP"
+            self.upgrade_options = self.upgrade_manager.get_options()
+
+        # Check Chests
+        if self.entity_manager.check_chest_collisions():
+            new_state = "LEVEL_UP"
+            self.upgrade_options = self.upgrade_manager.get_options(5)
+
+        if self.profiler.enabled:
+            self.update_counters()
+
+        return new_state
+
+    def update_counters(self):
+        """Refresh the profiler overlay's counters (some of them walk every frozen chunk)."""
+        profiler = self.profiler
+        # Broadphase pruning (candidate pairs vs actual hits)
+        broadphase = self.entity_manager.broadphase
+        profiler.set_counter("collision candidates", broadphase.candidate_pairs)
+        profiler.set_counter("collision hits", broadphase.hits)
+        profiler.set_counter("particles", len(self.particle_system))
+        profiler.set_counter("effects quality", self.particle_system.quality_name)
+        horde = self.entity_manager.horde
+        profiler.set_counter("flow field rebuilds", self.entity_manager.flow_field.rebuilds)
+        for (name, *_), size, queries in zip(LOD_TIERS, horde.tier_sizes, horde.tier_queries):
+            profiler.set_counter(f"lod {name}", f"{size} enemies / {queries} separation queries")
+        profiler.set_counter("load factor", f"{self.director.load_factor:.2f}")
+        profiler.set_counter("gems", f"{len(self.entity_manager.awake_gems)} awake / {len(self.entity_manager.gem_grid)}")
+        profiler.set_counter("frozen pickups", f"{len(self.entity_manager.chunks)} in {len(self.entity_manager.chunks.frozen)} chunks")
+        for name, pool in self.entity_manager.pools.items():
+            profiler.set_counter(f"pool {name}", pool.stats())
+
+def run_headless(seconds=VICTORY_TIME, seed=None, invincible=False, config_loader=None):
+    """Simulate a run as fast as the CPU allows, auto-picking the first upgrade offered."""
+    if seed is not None:
+        random.seed(seed)
+
+    world = World(config_loader or ConfigLoader(), player_input=False)
+    world.player.invincible = invincible
+
+    while world.stats.get_time_survived() < seconds:
+        new_state = world.step()
+        if new_state == "LEVEL_UP":
+            world.upgrade_manager.apply_upgrade(world.upgrade_options[0])
+        elif new_state in ("GAME_OVER", "VICTORY"):
+            break
+    return world
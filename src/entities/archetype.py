@@ -0,0 +1,72 @@
+ARCHETYPES = [] # archetype_id -> Archetype, shared by every run in the process
+
+class Archetype:
+    """Immutable, pre-resolved stats for one enemy type.
+
+    Built once per enemy config so per-frame code reads plain attributes
+    and flags instead of doing dict lookups with defaults. Enemies keep the
+    archetype_id; ARCHETYPES[archetype_id] gets the record back.
+    """
+    __slots__ = (
+        'archetype_id', 'enemy_id', 'config', 'name',
+        'hp', 'speed', 'damage', 'xp_value',
+        'width', 'height', 'color', 'sprite',
+        'is_ghost', 'is_ranged', 'is_boss', 'attack_range', 'attack_cooldown',
+        'split',
+    )
+
+    def __init__(self, enemy_id, config):
+        set_field = object.__setattr__
+        set_field(self, 'archetype_id', len(ARCHETYPES))
+        set_field(self, 'enemy_id', enemy_id)
+        set_field(self, 'config', config) # Source dict, kept for reference only
+        set_field(self, 'name', config.get('name', enemy_id))
+
+        set_field(self, 'hp', config.get('hp', 10))
+        set_field(self, 'speed', config.get('speed', 1.0))
+        set_field(self, 'damage', config.get('damage', 5))
+        set_field(self, 'xp_value', config.get('xp_value', 1))
+
+        set_field(self, 'width', config.get('width', 32))
+        set_field(self, 'height', config.get('height', 32))
+        set_field(self, 'color', tuple(config.get('color', [255, 0, 0])))
+        set_field(self, 'sprite', config.get('sprite', None))
+
+        set_field(self, 'is_ghost', config.get('type') == 'ghost')
+        set_field(self, 'is_ranged', config.get('attack_type') == 'ranged')
+        set_field(self, 'is_boss', config.get('is_boss', False))
+        set_field(self, 'attack_range', config.get('attack_range', 300))
+        set_field(self, 'attack_cooldown', config.get('attack_cooldown', 2000))
+        ARCHETYPES.append(self)
+
+        # Slimes split into two smaller copies of themselves that don't split again
+        split = None
+        if config.get('split_on_death', False):
+            mini_config = config.copy()
+            mini_config['hp'] = self.hp // 2
+            mini_config['width'] = self.width // 1.5
+            mini_config['height'] = self.height // 1.5
+            mini_config['split_on_death'] = False # Prevent infinite recursion
+            mini_config['xp_value'] = 1
+            split = Archetype("small_slime", mini_config)
+        set_field(self, 'split', split)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Archetype is immutable (tried to set {name})")
+
+    def __repr__(self):
+        return f"Archetype({self.archetype_id}, {self.enemy_id!r})"
+
+_by_config = {} # id(config dict) -> Archetype; the archetype keeps the dict alive
+
+def archetype_for(enemy_id, config):
+    """The archetype compiled from this config dict, compiling it on first use."""
+    archetype = _by_config.get(id(config))
+    if archetype is None or archetype.config is not config or archetype.enemy_id != enemy_id:
+        archetype = Archetype(enemy_id, config)
+        _by_config[id(config)] = archetype
+    return archetype
+
+def compile_archetypes(configs):
+    """{enemy_id: Archetype} for a loaded enemies table."""
+    return {enemy_id: archetype_for(enemy_id, config) for enemy_id, config in configs.items()}
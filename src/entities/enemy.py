@@ -1,105 +1,98 @@
 import pygame
 from core.config_loader import ConfigLoader
+from entities.archetype import Archetype, archetype_for
 
 class Enemy(pygame.sprite.Sprite):
     def __init__(self, pos, enemy_id, config_data, player, entity_manager=None):
         super().__init__()
         self.player = player
         self.entity_manager = entity_manager
-        self.config = config_data
         
-        # Load stats
-        self.hp = self.config.get('hp', 10)
-        self.speed = self.config.get('speed', 1.0)
-        self.damage = self.config.get('damage', 5)
-        self.xp_value = self.config.get('xp_value', 1)
-        self.pending_damage = 0
+        # Stats come from a shared archetype (config dicts are compiled on first use)
+        if not isinstance(config_data, Archetype):
+            config_data = archetype_for(enemy_id, config_data)
+        self.archetype_id = config_data.archetype_id
+        self.archetype = config_data
+        # Simulation state (owned by EnemyHorde once spawned)
+        self.horde = None
+        self.horde_index = -1
+        self._hp = config_data.hp
+        self._pending_damage = 0
+        self.speed = config_data.speed
+        self.damage = config_data.damage
+        self.xp_value = config_data.xp_value
         
         # Visuals
-        width = self.config.get('width', 32)
-        height = self.config.get('height', 32)
-        sprite_path = self.config.get('sprite', None)
-        color = self.config.get('color', [255, 0, 0])
-        
-        self.image = ConfigLoader.load_image(sprite_path, (width, height))
+        size = (config_data.width, config_data.height)
+        self.image = ConfigLoader.load_image(config_data.sprite, size)
         if self.image is None:
-            self.image = pygame.Surface((width, height))
-            self.image.fill(color)
+            self.image = ConfigLoader.load_shape('rect', size, config_data.color)
             
         self.rect = self.image.get_rect(center=pos)
-        self.pos = pygame.math.Vector2(pos)
-
-    def update(self, enemies_group=None):
-        # Simple chase logic
-        target_vector = pygame.math.Vector2(self.player.rect.center) - self.pos
-        if target_vector.length() > 0:
-            target_vector = target_vector.normalize()
-        
-        # Separation logic (avoid clumping)
-        separation_vector = pygame.math.Vector2(0, 0)
-        
-        # Ghosts ignore separation (or have very low weight) to stack
-        is_ghost = self.config.get('type') == 'ghost'
-        
-        # Optimization: Only run separation logic every 5 frames, staggered by ID
-        # We store the last calculated separation vector to use in between frames
-        if not hasattr(self, 'last_separation'):
-            self.last_separation = pygame.math.Vector2(0, 0)
-            
-        # Use id hash to stagger
-        should_update_separation = (pygame.time.get_ticks() // 16 + hash(self)) % 5 == 0
+        self._pos = pygame.math.Vector2(pos)
+        self._pos_step = -1 # Horde step _pos was last refreshed on
         
-        if enemies_group and not is_ghost and should_update_separation:
-            # Check for collisions with other enemies
-            # Using a smaller rect for collision to allow some overlap but push center
-            # We can't pass a rect to spritecollide, so we rely on self.rect
-            neighbors = pygame.sprite.spritecollide(self, enemies_group, False)
-            count = 0
-            for neighbor in neighbors:
-                if neighbor is not self:
-                    # Push away
-                    diff = self.pos - neighbor.pos
-                    dist = diff.length()
-                    if dist < 40 and dist > 0: # Only push if close
-                        separation_vector += diff.normalize() / dist
-                        count += 1
-            
-            if count > 0:
-                 separation_vector = separation_vector / count
-            
-            self.last_separation = separation_vector
+        self.is_ranged = config_data.is_ranged
+        self.last_attack_time = 0
+        self.attack_timer = None # Pending cooldown; no attacks until it fires
+
+    # While part of a horde, position, hp and pending damage live in the horde's arrays
+
+    @property
+    def pos(self):
+        # Refreshed at most once per horde step; the same vector is reused, so copy it to keep it
+        horde = self.horde
+        if horde is not None and self._pos_step != horde.step_count:
+            self._pos.update(horde.x[self.horde_index], horde.y[self.horde_index])
+            self._pos_step = horde.step_count
+        return self._pos
+
+    @property
+    def hp(self):
+        if self.horde is not None:
+            return self.horde.hp[self.horde_index]
+        return self._hp
+
+    @hp.setter
+    def hp(self, value):
+        if self.horde is not None:
+            self.horde.hp[self.horde_index] = value
         else:
-            separation_vector = getattr(self, 'last_separation', pygame.math.Vector2(0, 0))
-                 
-        # Combine vectors
-        # Chase weight: 1.0, Separation weight: 20.0 (needs to be strong when close)
-        final_vector = target_vector + (separation_vector * 50)
-        if final_vector.length() > 0:
-            final_vector = final_vector.normalize()
+            self._hp = value
+
+    @property
+    def pending_damage(self):
+        if self.horde is not None:
+            return self.horde.pending_damage[self.horde_index]
+        return self._pending_damage
+
+    @pending_damage.setter
+    def pending_damage(self, value):
+        if self.horde is not None:
+            self.horde.pending_damage[self.horde_index] = value
+        else:
+            self._pending_damage = value
+
+    def update_attack(self, current_time):
+        # Ranged Attack Logic (movement is advanced in bulk by EnemyHorde)
+        if not self.entity_manager or self.attack_timer is not None:
+            return
             
-        self.pos += final_vector * self.speed
-        self.rect.center = self.pos
+        archetype = self.archetype
+        dist_to_player = self.pos.distance_to(self.player.rect.center)
         
-        # Ranged Attack Logic
-        if self.config.get('attack_type') == 'ranged' and self.entity_manager:
-            current_time = pygame.time.get_ticks()
-            if not hasattr(self, 'last_attack_time'):
-                self.last_attack_time = 0
-                
-            cooldown = self.config.get('attack_cooldown', 2000)
-            attack_range = self.config.get('attack_range', 300)
-            
-            dist_to_player = self.pos.distance_to(self.player.rect.center)
-            
-            if dist_to_player <= attack_range and current_time - self.last_attack_time > cooldown:
-                self.last_attack_time = current_time
-                self.shoot_projectile()
+        if dist_to_player <= archetype.attack_range:
+            self.last_attack_time = current_time
+            self.attack_timer = self.entity_manager.clock.call_later(archetype.attack_cooldown, self.end_cooldown)
+            self.shoot_projectile()
+
+    def end_cooldown(self):
+        self.attack_timer = None
 
     def shoot_projectile(self):
-        from content.projectile import EnemyProjectile
-        proj = EnemyProjectile(self.rect.center, self.player.rect.center, self.config.get('damage', 10))
-        self.entity_manager.all_sprites.add(proj)
-        self.entity_manager.enemy_projectiles_group.add(proj)
+        pool = self.entity_manager.pools['enemy_projectile']
+        proj = pool.acquire(self.rect.center, self.player.rect.center, self.entity_manager.clock, self.damage)
+        self.entity_manager.spawn_enemy_projectile(proj)
 
     def take_damage(self, amount):
         self.hp -= amount
@@ -107,33 +100,24 @@ class Enemy(pygame.sprite.Sprite):
             self.hp = 0
             
             # Slime Split Logic
-            if self.config.get('split_on_death', False) and self.entity_manager:
-                # Spawn 2 smaller slimes
-                # We need to manually spawn them via spawner or entity manager
-                # Since we don't have direct access to spawner here, we can hack it or add a method to entity_manager
-                # Let's try to access spawner via entity_manager if possible, or just create Enemy instances
-                
-                # Actually, we can just create new Enemy instances and add them
-                # But we need the 'slime_small' config. 
-                # For simplicity, let's just spawn 'goblin' as a placeholder for small slime if we don't have a config
-                # Or better, let's just make them smaller versions of self
-                
+            split = self.archetype.split
+            if split is not None and self.entity_manager:
+                import random
                 for _ in range(2):
-                    # Create a mini-config based on self.config
-                    mini_config = self.config.copy()
-                    mini_config['hp'] = self.config['hp'] // 2
-                    mini_config['width'] = self.config['width'] // 1.5
-                    mini_config['height'] = self.config['height'] // 1.5
-                    mini_config['split_on_death'] = False # Prevent infinite recursion
-                    mini_config['xp_value'] = 1
-                    
                     # Offset position slightly
-                    import random
                     offset = pygame.math.Vector2(random.randint(-10, 10), random.randint(-10, 10))
                     
-                    new_slime = Enemy(self.pos + offset, "small_slime", mini_config, self.player, self.entity_manager)
+                    new_slime = Enemy(self.pos + offset, split.enemy_id, split, self.player, self.entity_manager)
                     self.entity_manager.add_enemy(new_slime)
 
             self.kill()
             return True # Dead
         return False
+
+    def kill(self):
+        if self.attack_timer is not None:
+            self.attack_timer.cancel()
+            self.attack_timer = None
+        if self.entity_manager:
+            self.entity_manager.despawn_enemy(self)
+        super().kill()
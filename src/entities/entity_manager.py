@@ -2,11 +2,32 @@ import pygame
 import random
 from content.chest import Chest
 from content.items import Vacuum, Heart
-from content.gem import Gem
+from content.gem import Gem, MAGNET_RADIUS
+from core.spatial_hash import SpatialHash
+from core.broadphase import Broadphase
+from core.flow_field import FlowField
+from core.chunks import ChunkStore
+from entities.horde import EnemyHorde
+from core.clock import GameClock
+from core.pool import ObjectPool, DEFAULT_POOL_CAPS
+from content.projectile import Projectile, EnemyProjectile, AxeProjectile
+
+# Gems live in their own grid. Every GEM_SWEEP_INTERVAL ms, the resting gems outside the
+# magnet radius in each cell holding more than gem_cell_limit gems are merged into one
+GEM_CELL = 128
+GEM_CELL_LIMIT = 12
+GEM_SWEEP_INTERVAL = 1000
+
+# A vacuum flies gems in cells within this distance individually and folds the rest into one
+VACUUM_FLY_RADIUS = 800
+
+# Pickup kinds as stored in frozen chunks (see stream_chunks)
+PICKUP_KINDS = (Gem, Chest, Vacuum, Heart)
 
 class EntityManager:
-    def __init__(self, player, stats, particle_system):
+    def __init__(self, player, stats, particle_system, clock=None, pool_caps=None, gem_cell_limit=GEM_CELL_LIMIT):
         self.player = player
+        self.clock = clock if clock is not None else GameClock()
         self.stats = stats
         self.particle_system = particle_system
         
@@ -19,6 +40,50 @@ class EntityManager:
         self.chests_group = pygame.sprite.Group()
         self.items_group = pygame.sprite.Group()
         
+        # Spatial index for enemy neighbour queries (kept in sync as enemies move)
+        self.enemy_grid = SpatialHash(cell_size=64)
+        
+        # Broadphase shared by all collision queries of a frame
+        self.broadphase = Broadphase()
+        self.broadphase.add_layer('enemies', self.enemy_grid)
+        self.broadphase.add_layer('pickups', SpatialHash(cell_size=128))
+        self.gem_grid = SpatialHash(cell_size=GEM_CELL)
+        self.broadphase.add_layer('gems', self.gem_grid)
+        self.broadphase.add_layer('enemy_projectiles', SpatialHash(cell_size=128))
+        
+        # Batched enemy simulation (positions/speeds stored as arrays), steered by a shared flow field
+        self.flow_field = FlowField()
+        self.horde = EnemyHorde(self.player, self.enemy_grid, self.flow_field)
+        
+        # Gems rest until the player's magnet (or a vacuum) wakes them; only awake gems update
+        self.awake_gems = {} # gem -> None; a dict so updates run in a repeatable order
+        self.gem_cell_limit = gem_cell_limit
+        self.next_gem_sweep = GEM_SWEEP_INTERVAL
+        
+        # Pickups in chunks the player has left behind, frozen to plain records
+        self.chunks = ChunkStore()
+        
+        # Start-of-step positions of the sprites drawn last frame (for render interpolation);
+        # everything off screen is left out, so a step costs O(visible) however big the world gets
+        self.previous_positions = {}
+        self.drawn_sprites = []
+        
+        # Draw statistics for the last frame
+        self.drawn_count = 0
+        self.culled_count = 0
+        
+        # Recycled short-lived sprites (caps per type, see DEFAULT_POOL_CAPS)
+        caps = dict(DEFAULT_POOL_CAPS, **(pool_caps or {}))
+        self.pools = {
+            'projectile': ObjectPool(Projectile, caps['projectile']),
+            'enemy_projectile': ObjectPool(EnemyProjectile, caps['enemy_projectile']),
+            'axe': ObjectPool(AxeProjectile, caps['axe']),
+            'gem': ObjectPool(Gem, caps['gem']),
+        }
+        for pool in self.pools.values():
+            # A recycled sprite must not be interpolated from where it last died
+            pool.on_acquire = self.forget_previous_position
+        
         # Add player to all_sprites
         self.all_sprites.add(self.player)
 
@@ -26,41 +91,290 @@ class EntityManager:
         for enemy in self.enemies_group:
             enemy.kill()
         self.enemies_group.empty()
+        self.enemy_grid.clear()
+        self.horde.clear()
 
     def spawn_enemy(self, enemy):
         self.all_sprites.add(enemy)
         self.enemies_group.add(enemy)
+        self.broadphase.insert('enemies', enemy)
+        self.horde.add(enemy)
+
+    def spawn_enemies(self, enemies):
+        # Batch version of spawn_enemy for hordes
+        self.all_sprites.add(*enemies)
+        self.enemies_group.add(*enemies)
+        self.broadphase.insert_many('enemies', enemies)
+        self.horde.extend(enemies)
+
+    def despawn_enemy(self, enemy):
+        self.enemy_grid.remove(enemy)
+        self.horde.remove(enemy)
         
     def add_enemy(self, enemy):
         self.spawn_enemy(enemy)
 
+    def spawn_enemy_projectile(self, proj):
+        self.all_sprites.add(proj)
+        self.enemy_projectiles_group.add(proj)
+        self.broadphase.insert('enemy_projectiles', proj)
+        proj.expiry = self.clock.call_later(proj.duration, self.despawn_enemy_projectile, proj)
+
+    def despawn_enemy_projectile(self, proj):
+        self.broadphase.remove('enemy_projectiles', proj)
+        proj.kill()
+
+    def pickup_layer(self, group):
+        # Gems have a layer of their own; chests and items share the pickups layer
+        return 'gems' if group is self.gems_group else 'pickups'
+
+    def add_pickup(self, pickup, group):
+        self.all_sprites.add(pickup)
+        group.add(pickup)
+        self.broadphase.insert(self.pickup_layer(group), pickup)
+
+    def collect_pickups(self, group):
+        # Returns (and removes) every pickup in group touching the player
+        layer = self.pickup_layer(group)
+        hits = [p for p in self.broadphase.query(layer, self.player.rect) if p in group]
+        for pickup in hits:
+            self.broadphase.remove(layer, pickup)
+            self.awake_gems.pop(pickup, None)
+            pickup.kill()
+        return hits
+
+    def remove_gem(self, gem):
+        self.gem_grid.remove(gem)
+        self.awake_gems.pop(gem, None)
+        gem.kill()
+
+    def update_gems(self):
+        # Wake resting gems inside the magnet radius, then move only the awake ones
+        awake = self.awake_gems
+        px, py = self.player.rect.center
+        for gem in self.gem_grid.query_radius((px, py), MAGNET_RADIUS):
+            if gem not in awake:
+                gx, gy = gem.rect.center
+                if (gx - px) ** 2 + (gy - py) ** 2 < gem.magnet_radius ** 2:
+                    awake[gem] = None
+        
+        for gem in list(awake):
+            gem.update()
+            if gem.speed > 0:
+                self.broadphase.move('gems', gem)
+            elif not gem.being_vacuumed:
+                awake.pop(gem, None) # Out of reach again: back to rest
+
+        now = self.clock.get_ticks()
+        if now >= self.next_gem_sweep:
+            self.next_gem_sweep = now + GEM_SWEEP_INTERVAL
+            self.merge_crowded_gems()
+
+    def merge_crowded_gems(self, limit=None, min_distance=MAGNET_RADIUS):
+        """In every cell holding more than limit gems (gem_cell_limit by default),
+        fold the resting gems at least min_distance from the player into one.
+
+        XP is preserved; returns how many gems were removed.
+        """
+        if limit is None:
+            limit = self.gem_cell_limit
+        px, py = self.player.rect.center
+        min_dist_sq = min_distance ** 2
+        awake = self.awake_gems
+        merged = 0
+        for bucket in list(self.gem_grid.cells.values()):
+            if len(bucket) <= limit:
+                continue
+            resting = [gem for gem in bucket if gem not in awake
+                       and (gem.rect.centerx - px) ** 2 + (gem.rect.centery - py) ** 2 >= min_dist_sq]
+            if len(resting) < 2:
+                continue
+            keeper = resting[0]
+            for gem in resting[1:]:
+                keeper.value += gem.value
+                self.remove_gem(gem)
+                merged += 1
+        return merged
+
+    def vacuum_gems(self):
+        """Pull every gem to the player.
+
+        Gems in cells within VACUUM_FLY_RADIUS fly in one by one. Every other
+        cell is emptied in bulk and its XP added to a single carrier gem (the
+        nearest one), so a late-game vacuum doesn't leave thousands of gems
+        ticking all the way in. Gems frozen in far chunks are folded into the
+        carrier too. Returns how many gems were folded away.
+        """
+        grid = self.gem_grid
+        size = grid.cell_size
+        px, py = self.player.rect.center
+        fly_sq = VACUUM_FLY_RADIUS ** 2
+        far_cells = []
+        for cell, bucket in grid.cells.items():
+            dx = (cell[0] + 0.5) * size - px
+            dy = (cell[1] + 0.5) * size - py
+            dist_sq = dx * dx + dy * dy
+            if dist_sq < fly_sq:
+                for gem in bucket:
+                    gem.vacuum()
+                self.awake_gems.update(dict.fromkeys(bucket))
+            else:
+                far_cells.append((dist_sq, cell))
+        frozen = self.chunks.pop_kind(PICKUP_KINDS.index(Gem))
+        if not far_cells and not frozen:
+            return 0
+
+        far_cells.sort()
+        carrier = None
+        folded = 0
+        for _, cell in far_cells:
+            for gem in grid.pop_cell(cell):
+                if carrier is None:
+                    carrier = gem
+                    continue
+                carrier.value += gem.value
+                self.awake_gems.pop(gem, None)
+                gem.kill()
+                folded += 1
+        if carrier is not None:
+            grid.insert(carrier, carrier.rect.center) # Its cell was popped above
+        if frozen:
+            if carrier is None:
+                # No live far gems: the nearest frozen one thaws to carry the rest
+                frozen.sort(key=lambda record: (record[0] - px) ** 2 + (record[1] - py) ** 2)
+                x, y, value = frozen.pop(0)
+                carrier = self.pools['gem'].acquire((x, y), self.player, value)
+                self.add_pickup(carrier, self.gems_group)
+            carrier.value += sum(value for _, _, value in frozen)
+            folded += len(frozen)
+        carrier.vacuum()
+        self.awake_gems[carrier] = None
+        return folded
+
+    def stream_chunks(self):
+        """Freeze pickups in chunks far from the player and thaw the ones near them again.
+
+        Only does work on the step the player crosses into another chunk.
+        """
+        chunks = self.chunks
+        if not chunks.recenter(self.player.rect.center):
+            return
+        
+        kinds = {kind: i for i, kind in enumerate(PICKUP_KINDS)}
+        for layer in ('gems', 'pickups'):
+            grid = self.broadphase.layers[layer]
+            size = grid.cell_size
+            far_cells = [cell for cell in grid.cells
+                         if chunks.is_far(chunks.chunk_for(((cell[0] + 0.5) * size, (cell[1] + 0.5) * size)))]
+            for cell in far_cells:
+                for sprite in grid.pop_cell(cell):
+                    if sprite in self.awake_gems:
+                        grid.insert(sprite, sprite.rect.center) # Still flying in: leave it live
+                        continue
+                    x, y = sprite.rect.center
+                    chunks.freeze(kinds[type(sprite)], x, y, getattr(sprite, 'value', 0))
+                    sprite.kill()
+        
+        for kind, x, y, value in chunks.thaw_nearby():
+            kind = PICKUP_KINDS[kind]
+            if kind is Gem:
+                self.add_pickup(self.pools['gem'].acquire((x, y), self.player, value), self.gems_group)
+            elif kind is Chest:
+                self.add_pickup(Chest((x, y)), self.chests_group)
+            else:
+                self.add_pickup(kind((x, y)), self.items_group)
+
     def reset(self):
         self.all_sprites.empty()
         self.enemies_group.empty()
         self.projectiles_group.empty()
+        self.enemy_projectiles_group.empty()
         self.gems_group.empty()
         self.chests_group.empty()
         self.items_group.empty()
+        for layer in self.broadphase.layers.values():
+            layer.clear()
+        self.horde.clear()
+        self.awake_gems.clear()
+        self.next_gem_sweep = GEM_SWEEP_INTERVAL
+        self.chunks.clear()
+        self.previous_positions = {}
+        self.drawn_sprites = []
         
         self.all_sprites.add(self.player)
 
+    def forget_previous_position(self, sprite):
+        self.previous_positions.pop(sprite, None)
+
+    def snapshot_positions(self):
+        # Sprites that scroll into view are drawn un-interpolated for their first frame
+        self.previous_positions = {sprite: sprite.rect.topleft for sprite in self.drawn_sprites}
+
     def update(self):
         self.player.update()
-        self.enemies_group.update(self.enemies_group)
+        self.stream_chunks()
+        self.flow_field.update(self.player.rect.center)
+        self.horde.update(self.clock.get_ticks())
         self.projectiles_group.update()
-        self.gems_group.update()
+        
+        # Keep the broadphase in sync with everything else that moves
+        for proj in self.enemy_projectiles_group:
+            proj.update()
+            self.broadphase.move('enemy_projectiles', proj)
+        self.update_gems()
         self.items_group.update()
         self.chests_group.update()
         
+        self.broadphase.begin_frame()
         self.handle_collisions()
 
-    def draw(self, screen, camera):
-        for sprite in self.all_sprites:
-            screen.blit(sprite.image, camera.apply(sprite))
+    def visible_sprites(self, view):
+        # Pull only what intersects the view out of the spatial indexes, in draw order
+        layers = self.broadphase.layers
+        margins = self.broadphase.margins
+        sprites = layers['gems'].query_rect(view, margins['gems'])
+        sprites += layers['pickups'].query_rect(view, margins['pickups'])
+        sprites += layers['enemies'].query_rect(view, margins['enemies'])
+        sprites.append(self.player)
+        sprites += self.projectiles_group.sprites() # Few, and hitboxes follow the player
+        sprites += layers['enemy_projectiles'].query_rect(view, margins['enemy_projectiles'])
+        return sprites
+
+    def draw(self, screen, camera, alpha=1.0):
+        ox, oy = camera.offset(alpha)
+        # Interpolation can nudge sprites a few pixels, so cull against a slightly larger view
+        view = pygame.Rect(-ox, -oy, camera.width, camera.height).inflate(32, 32)
+        colliderect = view.colliderect
+        
+        # Draw each sprite between its previous and current simulation position
+        back = alpha - 1.0
+        previous = self.previous_positions
+        blits = []
+        drawn = []
+        for sprite in self.visible_sprites(view):
+            rect = sprite.rect
+            if not colliderect(rect):
+                continue
+            drawn.append(sprite)
+            x, y = rect.topleft
+            prev = previous.get(sprite)
+            if prev is not None:
+                x += (x - prev[0]) * back
+                y += (y - prev[1]) * back
+            blits.append((sprite.image, (x + ox, y + oy)))
+        screen.blits(blits, False)
+        
+        self.drawn_sprites = drawn
+        self.drawn_count = len(blits)
+        self.culled_count = len(self.all_sprites) - self.drawn_count
 
     def handle_collisions(self):
         # Collision: Projectiles vs Enemies
-        hits = pygame.sprite.groupcollide(self.enemies_group, self.projectiles_group, False, False)
+        # Same shape as groupcollide: {enemy: [projectiles in group order]}
+        hits = {}
+        for proj in self.projectiles_group:
+            for enemy in self.broadphase.query('enemies', proj.rect):
+                hits.setdefault(enemy, []).append(proj)
         for enemy, projectiles in hits.items():
             for proj in projectiles:
                 damage = proj.damage
@@ -69,37 +383,27 @@ class EntityManager:
                 if enemy.take_damage(damage):
                     # Enemy Died
                     self.stats.enemies_killed += 1
-                    self.particle_system.create_explosion(enemy.rect.center, enemy.config.get('color', (255,0,0)))
+                    self.particle_system.create_explosion(enemy.rect.center, enemy.archetype.color)
                 
                     # Check if boss
-                    is_boss = enemy.config.get('is_boss', False)
-                    if is_boss:
-                        chest = Chest(enemy.rect.center)
-                        self.all_sprites.add(chest)
-                        self.chests_group.add(chest)
+                    if enemy.archetype.is_boss:
+                        self.add_pickup(Chest(enemy.rect.center), self.chests_group)
                     else:
                         # Spawn Chest (Very Rare)
                         if random.random() < 0.001: # 0.1% chance
-                             chest = Chest(enemy.rect.center)
-                             self.all_sprites.add(chest)
-                             self.chests_group.add(chest)
+                             self.add_pickup(Chest(enemy.rect.center), self.chests_group)
 
                         # Spawn Vacuum (Rare)
                         elif random.random() < 0.005: # 0.5% chance
-                            vacuum_item = Vacuum(enemy.rect.center)
-                            self.all_sprites.add(vacuum_item)
-                            self.items_group.add(vacuum_item)
+                            self.add_pickup(Vacuum(enemy.rect.center), self.items_group)
 
                         # Spawn Heart (Rare)
                         elif random.random() < 0.005: # 0.5% chance
-                            heart_item = Heart(enemy.rect.center)
-                            self.all_sprites.add(heart_item)
-                            self.items_group.add(heart_item)
+                            self.add_pickup(Heart(enemy.rect.center), self.items_group)
                         
                         # Spawn Gem
-                        gem = Gem(enemy.rect.center, self.player, enemy.xp_value)
-                        self.all_sprites.add(gem)
-                        self.gems_group.add(gem)
+                        gem = self.pools['gem'].acquire(enemy.rect.center, self.player, enemy.xp_value)
+                        self.add_pickup(gem, self.gems_group)
                     
                     break # Stop processing projectiles for this dead enemy
                 else:
@@ -113,31 +417,32 @@ class EntityManager:
                     proj.penetration -= 1
 
         # Collision: Player vs Items (Vacuum, Heart)
-        item_hits = pygame.sprite.spritecollide(self.player, self.items_group, True)
+        item_hits = self.collect_pickups(self.items_group)
         for item in item_hits:
             if isinstance(item, Vacuum):
-                for gem in self.gems_group:
-                    gem.vacuum()
+                self.vacuum_gems()
             elif isinstance(item, Heart):
                 self.player.heal(item.heal_amount)
 
         # Collision: Player vs Enemy Projectiles
-        proj_hits = pygame.sprite.spritecollide(self.player, self.enemy_projectiles_group, True)
+        proj_hits = self.broadphase.query('enemy_projectiles', self.player.rect)
         for proj in proj_hits:
+            self.despawn_enemy_projectile(proj)
             self.player.take_damage(proj.damage)
 
     def check_player_collisions(self):
         # Returns True if player died
-        enemy_hits = pygame.sprite.spritecollide(self.player, self.enemies_group, False)
+        enemy_hits = self.broadphase.query('enemies', self.player.rect)
         if enemy_hits:
-            damage = enemy_hits[0].damage
+            # One hit per step from the hardest hitter, whatever order the grid returned them in
+            damage = max(enemy.damage for enemy in enemy_hits)
             if self.player.take_damage(damage):
                 return True
         return False
 
     def check_gem_collisions(self):
         # Returns True if level up
-        gem_hits = pygame.sprite.spritecollide(self.player, self.gems_group, True)
+        gem_hits = self.collect_pickups(self.gems_group)
         for gem in gem_hits:
             if self.player.gain_xp(gem.value):
                 return True
@@ -145,7 +450,7 @@ class EntityManager:
 
     def check_chest_collisions(self):
         # Returns True if chest collected
-        chest_hits = pygame.sprite.spritecollide(self.player, self.chests_group, True)
+        chest_hits = self.collect_pickups(self.chests_group)
         if chest_hits:
             return True
         return False
@@ -0,0 +1,375 @@
+import math
+from array import array
+import pygame
+
+try:
+    import numpy as np # Optional: batches the per-step math over whole columns
+except ImportError:
+    np = None
+
+SEPARATION_RADIUS = 40
+SEPARATION_WEIGHT = 50
+
+# Below this many enemies the plain loop beats NumPy's per-call overhead
+VECTORIZE_MIN = 128
+
+# AI level of detail by distance from the player:
+# (name, max distance, steps between separation refreshes, steps between ranged attack checks)
+LOD_TIERS = (
+    ('near', 400, 3, 1),
+    ('mid', 900, 6, 6),
+    ('far', math.inf, 15, 15),
+)
+
+# Separation neighbours are found by sorting enemies into SEPARATION_RADIUS cells
+# keyed cx * CELL_KEY_STRIDE + cy and scanning the 3x3 block around each one; the
+# three cells of a column are adjacent keys, so each column is one sorted range
+CELL_KEY_STRIDE = 1 << 32
+COLUMN_KEYS = tuple(ox * CELL_KEY_STRIDE for ox in (-1, 0, 1))
+
+NO_CELL = -1 << 62 # cell column value for an enemy not (yet) in the spatial hash
+
+class EnemyHorde:
+    """Structure-of-arrays store that advances every live enemy in one call.
+
+    Positions, speeds, cached separation vectors, hp and pending damage live
+    in contiguous ``array('d')`` columns indexed by ``enemy.horde_index``;
+    the ``Enemy`` sprites are thin views that only hold what rendering and
+    collisions need. Removal swaps the last enemy into the freed slot so the
+    columns stay dense.
+
+    With NumPy installed, hordes of VECTORIZE_MIN or more are stepped as
+    whole-column operations on zero-copy views of the arrays; otherwise a
+    plain loop does the same work one enemy at a time.
+    """
+
+    def __init__(self, player, spatial_hash, flow_field=None):
+        self.player = player
+        self.spatial_hash = spatial_hash
+        self.flow_field = flow_field # Routes around obstacles; None or no obstacles = straight chase
+        self.enemies = []
+        self.x = array('d')
+        self.y = array('d')
+        self.speed = array('d')
+        self.sep_x = array('d')
+        self.sep_y = array('d')
+        self.hp = array('d')
+        self.pending_damage = array('d') # Damage already in flight towards each enemy
+        self.separates = array('b') # Ghosts stack instead of separating
+        self.ranged = array('b')
+        # Spatial hash cell each enemy was last filed under, so step_arrays can find
+        # the few that crossed a boundary without a lookup per enemy
+        self.cell_x = array('q')
+        self.cell_y = array('q')
+        self.step_count = 0
+        # Per-tier stats from the last update: enemies in the tier, separation queries run
+        self.tier_sizes = [0] * len(LOD_TIERS)
+        self.tier_queries = [0] * len(LOD_TIERS)
+
+    def __len__(self):
+        return len(self.enemies)
+
+    def columns(self):
+        return (self.x, self.y, self.speed, self.sep_x, self.sep_y,
+                self.hp, self.pending_damage, self.separates, self.ranged,
+                self.cell_x, self.cell_y)
+
+    def add(self, enemy):
+        self.extend((enemy,))
+
+    def extend(self, enemies):
+        # Batch add: one extend per column instead of one append per enemy
+        positions = [enemy.pos for enemy in enemies]
+        self.x.extend(pos.x for pos in positions)
+        self.y.extend(pos.y for pos in positions)
+        self.speed.extend(enemy.speed for enemy in enemies)
+        self.sep_x.frombytes(bytes(8 * len(enemies)))
+        self.sep_y.frombytes(bytes(8 * len(enemies)))
+        self.hp.extend(enemy._hp for enemy in enemies)
+        self.pending_damage.extend(enemy._pending_damage for enemy in enemies)
+        self.separates.extend(0 if enemy.archetype.is_ghost else 1 for enemy in enemies)
+        self.ranged.extend(1 if enemy.is_ranged else 0 for enemy in enemies)
+        cells = [self.spatial_hash.sprite_cells.get(enemy, (NO_CELL, NO_CELL)) for enemy in enemies]
+        self.cell_x.extend(cell[0] for cell in cells)
+        self.cell_y.extend(cell[1] for cell in cells)
+        start = len(self.enemies)
+        for i, enemy in enumerate(enemies):
+            enemy.horde_index = start + i
+            enemy.horde = self
+            enemy._pos_step = -1
+        self.enemies.extend(enemies)
+
+    def detach(self, enemy):
+        # Hand the state kept in the columns back to the sprite before it leaves
+        i = enemy.horde_index
+        enemy._pos = pygame.math.Vector2(self.x[i], self.y[i])
+        enemy._hp = self.hp[i]
+        enemy._pending_damage = self.pending_damage[i]
+        enemy.horde = None
+        enemy.horde_index = -1
+
+    def remove(self, enemy):
+        if enemy.horde is not self:
+            return
+        i = enemy.horde_index
+        self.detach(enemy)
+
+        last = len(self.enemies) - 1
+        columns = self.columns()
+        if i != last:
+            moved = self.enemies[last]
+            self.enemies[i] = moved
+            moved.horde_index = i
+            for column in columns:
+                column[i] = column[last]
+        for column in columns:
+            column.pop()
+        self.enemies.pop()
+
+    def clear(self):
+        for enemy in self.enemies:
+            self.detach(enemy)
+        self.enemies.clear()
+        for column in self.columns():
+            del column[:]
+
+    def update(self, current_time):
+        """Advance chase, separation and ranged attacks for the whole horde.
+
+        Every enemy chases every step. Separation and ranged attack checks
+        run at its distance tier's rate, staggered by horde index so each
+        step refreshes an even slice of every tier.
+        """
+        self.step_count += 1
+        if np is not None and len(self.enemies) >= VECTORIZE_MIN:
+            ranged = self.step_arrays(self.step_count)
+        else:
+            ranged = self.step_loop(self.step_count)
+
+        # Attacks may spawn projectiles, so run them after the arrays are settled
+        for enemy in ranged:
+            enemy.update_attack(current_time)
+
+    def step_loop(self, step):
+        """One step, enemy by enemy; returns the ranged enemies due an attack check."""
+        (_, near_dist, near_sep, near_atk), (_, mid_dist, mid_sep, mid_atk), (_, _, far_sep, far_atk) = LOD_TIERS
+        tier_sizes = [0, 0, 0]
+        tier_queries = [0, 0, 0]
+
+        enemies = self.enemies
+        xs, ys, speeds = self.x, self.y, self.speed
+        sep_xs, sep_ys, separates, ranged_flags = self.sep_x, self.sep_y, self.separates, self.ranged
+        cell_xs, cell_ys = self.cell_x, self.cell_y
+        grid = self.spatial_hash
+        query = grid.query_radius
+        move = grid.move
+        sprite_cells = grid.sprite_cells
+        cell_size = grid.cell_size
+        sqrt = math.sqrt
+        px, py = self.player.rect.center
+        radius_sq = SEPARATION_RADIUS * SEPARATION_RADIUS
+        ranged = []
+        field = self.flow_field
+        routed = field is not None and bool(field.blocked)
+        if routed:
+            index_of, clear, flow_x, flow_y = field.index_of, field.clear, field.dir_x, field.dir_y
+
+        for i in range(len(enemies)):
+            x = xs[i]
+            y = ys[i]
+
+            # Chase
+            dx = px - x
+            dy = py - y
+            dist_to_player = sqrt(dx * dx + dy * dy)
+            if dist_to_player > 0:
+                dx /= dist_to_player
+                dy /= dist_to_player
+            if routed:
+                # No straight line to the player: follow the flow field around obstacles
+                cell = index_of(x, y)
+                if cell >= 0 and not clear[cell] and (flow_x[cell] or flow_y[cell]):
+                    dx = flow_x[cell]
+                    dy = flow_y[cell]
+
+            # Level of detail tier
+            if dist_to_player < near_dist:
+                tier, sep_period, attack_period = 0, near_sep, near_atk
+            elif dist_to_player < mid_dist:
+                tier, sep_period, attack_period = 1, mid_sep, mid_atk
+            else:
+                tier, sep_period, attack_period = 2, far_sep, far_atk
+            tier_sizes[tier] += 1
+
+            # Separation, refreshed for 1/sep_period of the tier per step
+            if separates[i] and (i + step) % sep_period == 0:
+                tier_queries[tier] += 1
+                sx = sy = 0.0
+                count = 0
+                for neighbor in query((x, y), SEPARATION_RADIUS):
+                    j = neighbor.horde_index
+                    if j == i or j < 0:
+                        continue
+                    ox = x - xs[j]
+                    oy = y - ys[j]
+                    d_sq = ox * ox + oy * oy
+                    if 0 < d_sq < radius_sq:
+                        # normalize(diff) / dist == diff / dist^2
+                        sx += ox / d_sq
+                        sy += oy / d_sq
+                        count += 1
+                if count:
+                    sx /= count
+                    sy /= count
+                sep_xs[i] = sx
+                sep_ys[i] = sy
+
+            fx = dx + sep_xs[i] * SEPARATION_WEIGHT
+            fy = dy + sep_ys[i] * SEPARATION_WEIGHT
+            length = sqrt(fx * fx + fy * fy)
+            if length > 0:
+                speed = speeds[i] / length
+                x += fx * speed
+                y += fy * speed
+                xs[i] = x
+                ys[i] = y
+
+            enemy = enemies[i]
+            enemy.rect.center = (x, y)
+            # Only touch the spatial hash when the enemy crosses a cell boundary
+            cell = (int(x // cell_size), int(y // cell_size))
+            if sprite_cells.get(enemy) != cell:
+                move(enemy, (x, y))
+                cell_xs[i], cell_ys[i] = cell
+            if ranged_flags[i] and (i + step) % attack_period == 0:
+                ranged.append(enemy)
+
+        self.tier_sizes = tier_sizes
+        self.tier_queries = tier_queries
+        return ranged
+
+    def step_arrays(self, step):
+        """One step as whole-column NumPy passes; same rules as step_loop.
+
+        Separation reads every neighbour's position from the start of the
+        step (step_loop sees the enemies it has already moved), which only
+        shifts the result by a fraction of a pixel.
+        """
+        n = len(self.enemies)
+        x = np.frombuffer(self.x)
+        y = np.frombuffer(self.y)
+        sep_x = np.frombuffer(self.sep_x)
+        sep_y = np.frombuffer(self.sep_y)
+        px, py = self.player.rect.center
+
+        # Chase
+        dx = px - x
+        dy = py - y
+        dist = np.hypot(dx, dy)
+        inv_dist = np.divide(1.0, dist, out=np.zeros(n), where=dist > 0)
+        dx *= inv_dist
+        dy *= inv_dist
+        field = self.flow_field
+        if field is not None and field.blocked and field.origin is not None:
+            # No straight line to the player: follow the flow field around obstacles
+            size = field.size
+            col = np.floor_divide(x, field.cell_size).astype(np.int64) - (field.origin[0] - field.radius)
+            row = np.floor_divide(y, field.cell_size).astype(np.int64) - (field.origin[1] - field.radius)
+            inside = (col >= 0) & (col < size) & (row >= 0) & (row < size)
+            cell = np.where(inside, row * size + col, 0)
+            flow_x = np.frombuffer(field.dir_x)[cell]
+            flow_y = np.frombuffer(field.dir_y)[cell]
+            routed = inside & (np.frombuffer(field.clear, dtype=np.int8)[cell] == 0) & ((flow_x != 0) | (flow_y != 0))
+            dx = np.where(routed, flow_x, dx)
+            dy = np.where(routed, flow_y, dy)
+
+        # Level of detail tier
+        (_, near_dist, near_sep, near_atk), (_, mid_dist, mid_sep, mid_atk), (_, _, far_sep, far_atk) = LOD_TIERS
+        tier = np.where(dist < near_dist, 0, np.where(dist < mid_dist, 1, 2))
+        phase = np.arange(step, step + n)
+
+        # Separation, refreshed for 1/sep_period of the tier per step
+        sep_period = np.array((near_sep, mid_sep, far_sep))[tier]
+        refresh = np.flatnonzero((np.frombuffer(self.separates, dtype=np.int8) != 0) & (phase % sep_period == 0))
+        if len(refresh):
+            sx, sy = self.separation(x, y, refresh)
+            sep_x[refresh] = sx
+            sep_y[refresh] = sy
+
+        fx = dx + sep_x * SEPARATION_WEIGHT
+        fy = dy + sep_y * SEPARATION_WEIGHT
+        length = np.hypot(fx, fy)
+        scale = np.divide(np.frombuffer(self.speed), length, out=np.zeros(n), where=length > 0)
+        x += fx * scale
+        y += fy * scale
+
+        # Sprites still need their rects set one by one, but only enemies that
+        # crossed a cell boundary touch the spatial hash
+        enemies = self.enemies
+        xl = x.tolist()
+        yl = y.tolist()
+        for enemy, ex, ey in zip(enemies, xl, yl):
+            enemy.rect.center = (ex, ey)
+        grid = self.spatial_hash
+        cell_x = np.floor_divide(x, grid.cell_size).astype(np.int64)
+        cell_y = np.floor_divide(y, grid.cell_size).astype(np.int64)
+        old_x = np.frombuffer(self.cell_x, dtype=np.int64)
+        old_y = np.frombuffer(self.cell_y, dtype=np.int64)
+        crossed = np.flatnonzero((cell_x != old_x) | (cell_y != old_y))
+        if len(crossed):
+            move = grid.move
+            for i in crossed.tolist():
+                move(enemies[i], (xl[i], yl[i]))
+            old_x[crossed] = cell_x[crossed]
+            old_y[crossed] = cell_y[crossed]
+
+        attack_period = np.array((near_atk, mid_atk, far_atk))[tier]
+        due = (np.frombuffer(self.ranged, dtype=np.int8) != 0) & (phase % attack_period == 0)
+        ranged = [enemies[i] for i in np.flatnonzero(due).tolist()]
+
+        self.tier_sizes = np.bincount(tier, minlength=3).tolist()
+        self.tier_queries = np.bincount(tier[refresh], minlength=3).tolist()
+        return ranged
+
+    def separation(self, x, y, indices):
+        """Mean of diff / dist^2 over the neighbours within SEPARATION_RADIUS of each enemy in indices."""
+        cell_x = np.floor_divide(x, SEPARATION_RADIUS).astype(np.int64)
+        cell_y = np.floor_divide(y, SEPARATION_RADIUS).astype(np.int64)
+        keys = cell_x * CELL_KEY_STRIDE + cell_y
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+
+        # Every (query, candidate) pair from the 3x3 block of cells around each query
+        query_keys = keys[indices]
+        local = np.arange(len(indices))
+        pair_query = []
+        pair_other = []
+        for offset in COLUMN_KEYS:
+            lo = np.searchsorted(sorted_keys, query_keys + (offset - 1), 'left')
+            hi = np.searchsorted(sorted_keys, query_keys + (offset + 1), 'right')
+            counts = hi - lo
+            total = int(counts.sum())
+            if not total:
+                continue
+            # Flattened ranges lo[k]..hi[k] for every query k
+            starts = np.repeat(lo - np.cumsum(counts) + counts, counts)
+            pair_query.append(np.repeat(local, counts))
+            pair_other.append(order[starts + np.arange(total)])
+        if not pair_query:
+            zeros = np.zeros(len(indices))
+            return zeros, zeros
+        pair_query = np.concatenate(pair_query)
+        pair_other = np.concatenate(pair_other)
+
+        ox = x[indices[pair_query]] - x[pair_other]
+        oy = y[indices[pair_query]] - y[pair_other]
+        d_sq = ox * ox + oy * oy
+        near = (d_sq > 0) & (d_sq < SEPARATION_RADIUS * SEPARATION_RADIUS)
+        pair_query = pair_query[near]
+        d_sq = d_sq[near]
+        # normalize(diff) / dist == diff / dist^2
+        sx = np.bincount(pair_query, weights=ox[near] / d_sq, minlength=len(indices))
+        sy = np.bincount(pair_query, weights=oy[near] / d_sq, minlength=len(indices))
+        count = np.bincount(pair_query, minlength=len(indices))
+        count[count == 0] = 1
+        return sx / count, sy / count
@@ -1,9 +1,11 @@
 import pygame
+from core.clock import GameClock
 
 class Player(pygame.sprite.Sprite):
-    def __init__(self, pos, joystick=None):
+    def __init__(self, pos, joystick=None, clock=None):
         super().__init__()
         self.joystick = joystick
+        self.clock = clock if clock is not None else GameClock()
         self.image = pygame.Surface((32, 32))
         self.image.fill((0, 255, 255)) # Cyan player
         self.rect = self.image.get_rect(center=pos)
@@ -16,6 +18,7 @@ class Player(pygame.sprite.Sprite):
         self.level = 1
         self.next_level_xp = 10
         self.invincible = False
+        self.input_enabled = True # Off for headless simulation
         self.weapons = []
         
         # Movement vector
@@ -23,15 +26,15 @@ class Player(pygame.sprite.Sprite):
         self.last_move = pygame.math.Vector2(1, 0) # Default facing right
         
         # Invulnerability
-        self.last_hit_time = 0
+        self.last_hit_time = None # Game time of the last hit taken
         self.invulnerability_duration = 500 # ms
 
     def take_damage(self, amount):
         if self.invincible:
             return False
             
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_hit_time > self.invulnerability_duration:
+        current_time = self.clock.get_ticks()
+        if self.last_hit_time is None or current_time - self.last_hit_time > self.invulnerability_duration:
             self.hp -= amount
             self.last_hit_time = current_time
             print(f"Player took {amount} damage. HP: {self.hp}")
@@ -83,7 +86,8 @@ class Player(pygame.sprite.Sprite):
             self.last_move = self.velocity.copy()
 
     def update(self):
-        self.get_input()
+        if self.input_enabled:
+            self.get_input()
         self.rect.x += self.velocity.x
         self.rect.y += self.velocity.y
         # Removed clamping to allow infinite movement
@@ -1,10 +1,17 @@
-import pygame
+import bisect
+import math
 import random
 from entities.enemy import Enemy
+from entities.archetype import compile_archetypes
+from core.clock import GameClock
+
+BASE_ENEMY_CAP = 500 # Scaled by Director.get_enemy_cap_multiplier()
+HORDE_SIZE = 30
 
 class Spawner:
-    def __init__(self, config_loader, player, entity_manager, director=None):
+    def __init__(self, config_loader, player, entity_manager, director=None, clock=None):
         self.config_loader = config_loader
+        self.clock = clock if clock is not None else GameClock()
         self.player = player
         self.entity_manager = entity_manager
         self.director = director
@@ -12,11 +19,13 @@ class Spawner:
         self.enemies_group = entity_manager.enemies_group
         
         self.enemy_configs = self.config_loader.load_enemies()
-        self.spawn_timer = 0
+        self.archetypes = compile_archetypes(self.enemy_configs)
+        self.spawn_timer = 0 # Fixed steps since the last regular spawn
         
         # Wave Management
         self.game_time = 0 # seconds
-        self.start_ticks = pygame.time.get_ticks()
+        self.start_ticks = self.clock.get_ticks()
+        self.last_horde_time = None
         
         # Boss State
         self.boss_spawned = False
@@ -35,111 +44,107 @@ class Spawner:
             {'time': 420, 'interval': 15, 'enemies': ['orc', 'mage', 'necromancer']},
             {'time': 600, 'interval': 10, 'enemies': ['mage', 'necromancer', 'tank_orc']},
         ]
+        self.compile_waves()
+        
+    def compile_waves(self):
+        # Sorted start times for bisect, with each wave's roster resolved to archetypes.
+        # Unknown ids stay in the roster as None: picking one skips that spawn, as before.
+        self.waves.sort(key=lambda wave: wave['time'])
+        self.wave_times = [wave['time'] for wave in self.waves]
+        self.wave_rosters = []
+        for wave in self.waves:
+            roster = [self.archetypes.get(enemy_id) for enemy_id in wave['enemies']]
+            missing = [enemy_id for enemy_id in wave['enemies'] if enemy_id not in self.archetypes]
+            if missing:
+                print(f"Warning: wave at {wave['time']}s references unknown enemies {missing}")
+            self.wave_rosters.append(roster)
+        
+    def current_wave_index(self):
+        # Latest wave that has started, or -1 before the first one
+        return bisect.bisect_right(self.wave_times, self.game_time) - 1
+        
+    def enemy_budget(self):
+        """How many more enemies may be spawned under the director-scaled cap."""
+        cap = BASE_ENEMY_CAP
+        if self.director:
+            cap *= self.director.get_enemy_cap_multiplier()
+        return int(cap) - len(self.enemies_group)
         
     def update(self):
-        current_ticks = pygame.time.get_ticks()
+        current_ticks = self.clock.get_ticks()
         self.game_time = (current_ticks - self.start_ticks) / 1000.0
         
         self.spawn_timer += 1
+        budget = self.enemy_budget()
         
-        # Determine current wave
-        # Determine current wave
-        current_wave = None
-        # Iterate backwards to find the latest wave that has started
-        for i in range(len(self.waves) - 1, -1, -1):
-            if self.game_time >= self.waves[i]['time']:
-                current_wave = self.waves[i]
-                break
-                
-        if current_wave:
-            interval = current_wave['interval']
-            # Ramp up difficulty within wave?
+        wave_index = self.current_wave_index()
+        if wave_index >= 0:
+            interval = self.waves[wave_index]['interval']
             # Director Multiplier
-            if hasattr(self, 'director') and self.director: # Check if director exists and is not None
+            if self.director:
                 interval /= self.director.get_spawn_rate_multiplier()
                 
             if self.spawn_timer >= interval:
                 self.spawn_timer = 0
-                self.spawn_enemy(current_wave['enemies'])
+                # At the cap the spawn is dropped rather than queued
+                if budget > 0:
+                    archetype = random.choice(self.wave_rosters[wave_index])
+                    if archetype is not None:
+                        self.entity_manager.spawn_enemy(self.make_enemy(archetype, self.get_spawn_pos()))
+                        budget -= 1
                 
-        # Horde Event (Every 60 seconds, spawn 30 enemies)
+        # Horde Event (Every 60 seconds, spawn up to 30 enemies)
         if int(self.game_time) > 0 and int(self.game_time) % 60 == 0:
-             if not hasattr(self, 'last_horde_time') or self.game_time - self.last_horde_time > 5:
-                 self.spawn_horde()
+             if self.last_horde_time is None or self.game_time - self.last_horde_time > 5:
+                 self.spawn_horde(budget)
                  self.last_horde_time = self.game_time
 
-        # Boss Spawn (at 5 minutes / 300s)
+        # Boss Spawn (at 5 minutes / 300s), exempt from the cap
         if not self.boss_spawned and self.game_time >= 300:
             self.spawn_boss()
             self.boss_spawned = True
-            
-        # Limit total enemies
-        cap = 500
-        if hasattr(self, 'director') and self.director: # Check if director exists and is not None
-            cap *= self.director.get_enemy_cap_multiplier()
-            
-        if len(self.enemies_group) >= cap:
-            return
 
-    def spawn_horde(self):
-        print("HORDE SPAWNED!")
-        # Spawn 30 enemies in a circle
-        count = 30
+    def make_enemy(self, archetype, pos):
+        return Enemy(pos, archetype.enemy_id, archetype, self.player, self.entity_manager)
+
+    def spawn_horde(self, budget=HORDE_SIZE):
+        # Spawn up to HORDE_SIZE enemies in a circle, inserted as one batch
+        count = min(HORDE_SIZE, budget)
+        if count <= 0:
+            return
         radius = 500
-        import math
         
         # Determine enemy type for horde based on time
         enemy_id = 'bat'
         if self.game_time > 120: enemy_id = 'wolf'
         elif self.game_time > 60: enemy_id = 'goblin'
         
-        if enemy_id not in self.enemy_configs: return
-        config = self.enemy_configs[enemy_id]
+        if enemy_id not in self.archetypes: return
+        archetype = self.archetypes[enemy_id]
+        print("HORDE SPAWNED!")
 
+        cx, cy = self.player.rect.center
+        horde = []
         for i in range(count):
-            angle = (360 / count) * i
-            rad = math.radians(angle)
-            offset_x = math.cos(rad) * radius
-            offset_y = math.sin(rad) * radius
-            spawn_pos = (self.player.rect.centerx + offset_x, self.player.rect.centery + offset_y)
-            
-            enemy = Enemy(spawn_pos, enemy_id, config, self.player, self.entity_manager)
-            self.all_sprites.add(enemy)
-            self.enemies_group.add(enemy)
+            rad = math.radians((360 / count) * i)
+            horde.append(self.make_enemy(archetype, (cx + math.cos(rad) * radius, cy + math.sin(rad) * radius)))
+        self.entity_manager.spawn_enemies(horde)
 
     def spawn_boss(self):
-        boss_ids = [k for k, v in self.enemy_configs.items() if v.get('is_boss', False)]
+        boss_ids = [k for k, v in self.archetypes.items() if v.is_boss]
         if not boss_ids:
             return
             
         enemy_id = boss_ids[0] 
-        config = self.enemy_configs[enemy_id]
+        archetype = self.archetypes[enemy_id]
         
         spawn_pos = self.get_spawn_pos()
         print(f"Spawning Boss: {enemy_id}")
-        enemy = Enemy(spawn_pos, enemy_id, config, self.player, self.entity_manager)
-        self.all_sprites.add(enemy)
-        self.enemies_group.add(enemy)
-            
-    def spawn_enemy(self, allowed_enemies):
-        if not allowed_enemies:
-            return
+        self.entity_manager.spawn_enemy(self.make_enemy(archetype, spawn_pos))
             
-        enemy_id = random.choice(allowed_enemies)
-        if enemy_id not in self.enemy_configs:
-            return
-            
-        config = self.enemy_configs[enemy_id]
-        spawn_pos = self.get_spawn_pos()
-            
-        enemy = Enemy(spawn_pos, enemy_id, config, self.player, self.entity_manager)
-        self.all_sprites.add(enemy)
-        self.enemies_group.add(enemy)
-
     def get_spawn_pos(self):
         spawn_radius = 600
         angle = random.uniform(0, 360)
-        import math
         rad = math.radians(angle)
         offset_x = math.cos(rad) * spawn_radius
         offset_y = math.sin(rad) * spawn_radius
@@ -1,5 +1,40 @@
-from core.game import Game
+import argparse
+import os
+import sys
+import time
+
+# Allow both `python src/main.py` and `python -m src.main`
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Vampire Slopvivors")
+    parser.add_argument('--headless', action='store_true', help="Run the simulation without a window, as fast as possible")
+    parser.add_argument('--seconds', type=float, default=900, help="Game seconds to simulate in headless mode")
+    parser.add_argument('--seed', type=int, default=None, help="Random seed for reproducible headless runs")
+    parser.add_argument('--invincible', action='store_true', help="Headless player cannot die")
+    parser.add_argument('--fps', type=int, default=60, help="Render frame cap (0 = uncapped)")
+    parser.add_argument('--frame-budget', type=float, default=None, help="p95 frame time in ms above which spawns are throttled (default 20)")
+    return parser.parse_args()
+
+def run_headless(args):
+    from core.world import run_headless as simulate
+
+    start = time.perf_counter()
+    world = simulate(args.seconds, seed=args.seed, invincible=args.invincible)
+    elapsed = time.perf_counter() - start
+
+    game_seconds = world.stats.get_time_survived()
+    print(f"Simulated {game_seconds:.1f}s of game time in {elapsed:.2f}s ({game_seconds / max(elapsed, 1e-9):.1f}x)")
+    print(f"Enemies Killed: {world.stats.enemies_killed}")
+    print(f"Damage Dealt: {world.stats.damage_dealt}")
+    print(f"Level Reached: {world.player.level}")
+    print(f"Enemies Alive: {len(world.entity_manager.enemies_group)}")
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    args = parse_args()
+    if args.headless:
+        run_headless(args)
+    else:
+        from core.game import Game
+        game = Game(render_fps=args.fps, frame_budget=args.frame_budget)
+        game.run()
@@ -4,6 +4,7 @@ from entities.player import Player
 from entities.enemy import Enemy
 from entities.spawner import Spawner
 from core.config_loader import ConfigLoader
+from content.gem import Gem
 
 # Mock pygame
 pygame.init()
@@ -58,26 +59,886 @@ class TestEnemy(unittest.TestCase):
         self.assertTrue(dead)
         self.assertEqual(self.enemy.hp, 0)
 
+    def test_contact_damage_takes_hardest_hitter(self):
+        from core.stats import GameStats
+        from entities.entity_manager import EntityManager
+        entity_manager = EntityManager(self.player, GameStats(), None)
+        for damage in (3, 9, 5):
+            config = dict(self.config, damage=damage)
+            entity_manager.spawn_enemy(Enemy(self.player.rect.center, 'test_enemy', config, self.player))
+        hp = self.player.hp
+        self.assertFalse(entity_manager.check_player_collisions())
+        self.assertEqual(self.player.hp, hp - 9)
+
+    def test_archetype_is_shared_and_immutable(self):
+        from entities.archetype import ARCHETYPES
+        other = Enemy((0, 0), 'test_enemy', self.config, self.player)
+        self.assertIs(other.archetype, self.enemy.archetype)
+        self.assertIs(ARCHETYPES[other.archetype_id], other.archetype)
+        with self.assertRaises(AttributeError):
+            other.archetype.hp = 99
+
+    def test_slime_splits_into_derived_archetype(self):
+        spawned = []
+        class Manager:
+            def add_enemy(self, enemy): spawned.append(enemy)
+            def despawn_enemy(self, enemy): pass
+        config = {'hp': 30, 'width': 28, 'height': 28, 'split_on_death': True, 'xp_value': 5}
+        slime = Enemy((0, 0), 'slime', config, self.player, Manager())
+        slime.take_damage(30)
+        self.assertEqual(len(spawned), 2)
+        self.assertIs(spawned[0].archetype, slime.archetype.split)
+        self.assertEqual((spawned[0].hp, spawned[0].xp_value), (15, 1))
+        self.assertIsNone(spawned[0].archetype.split)
+
+class TestSpatialHash(unittest.TestCase):
+    def setUp(self):
+        from core.spatial_hash import SpatialHash
+        self.grid = SpatialHash(cell_size=64)
+        self.a = pygame.sprite.Sprite()
+        self.b = pygame.sprite.Sprite()
+        self.grid.insert(self.a, (10, 10))
+        self.grid.insert(self.b, (500, 500))
+
+    def test_query_radius(self):
+        self.assertEqual(self.grid.query_radius((20, 20), 40), [self.a])
+
+    def test_move_across_cells(self):
+        self.grid.move(self.a, (490, 490))
+        self.assertCountEqual(self.grid.query_radius((500, 500), 40), [self.a, self.b])
+        self.assertEqual(self.grid.query_radius((10, 10), 40), [])
+
+    def test_bucket_order_is_insertion_order(self):
+        sprites = [pygame.sprite.Sprite() for _ in range(20)]
+        for sprite in sprites:
+            self.grid.insert(sprite, (600, 600))
+        self.grid.remove(sprites[3])
+        expected = sprites[:3] + sprites[4:]
+        self.assertEqual(self.grid.query_radius((600, 600), 10), expected)
+        self.assertEqual(self.grid.pop_cell(self.grid.cell_for((600, 600))), expected)
+
+    def test_nearest_matches_brute_force(self):
+        import random
+        from core.spatial_hash import SpatialHash
+        rng = random.Random(1)
+        grid = SpatialHash(cell_size=64)
+        sprites = []
+        for i in range(300):
+            sprite = pygame.sprite.Sprite()
+            sprite.rect = pygame.Rect(0, 0, 8, 8)
+            sprite.rect.center = (rng.randint(-2000, 2000), rng.randint(-2000, 2000))
+            sprite.viable = i % 3 != 0
+            grid.insert(sprite, sprite.rect.center)
+            sprites.append(sprite)
+
+        dist = lambda s: (s.rect.centerx - 37) ** 2 + (s.rect.centery + 15) ** 2
+        expected = sorted((s for s in sprites if s.viable), key=dist)[:5]
+        result = grid.nearest((37, -15), 5, lambda s: s.viable)
+        self.assertEqual([dist(s) for s in result], [dist(s) for s in expected])
+        self.assertEqual(len(set(result)), 5)
+
+    def test_nearest_breaks_ties_by_insertion(self):
+        from core.spatial_hash import SpatialHash
+        grid = SpatialHash(cell_size=64)
+        sprites = []
+        for x, y in [(100, 0), (0, 100), (-100, 0), (0, -100)]:
+            sprite = pygame.sprite.Sprite()
+            sprite.rect = pygame.Rect(0, 0, 8, 8)
+            sprite.rect.center = (x, y)
+            grid.insert(sprite, sprite.rect.center)
+            sprites.append(sprite)
+        self.assertEqual(grid.nearest((0, 0), 4), sprites)
+        self.assertEqual(grid.nearest((0, 0), 2), sprites[:2])
+
+    def test_remove(self):
+        self.grid.remove(self.a)
+        self.grid.remove(self.a) # Removing twice is harmless
+        self.assertEqual(len(self.grid), 1)
+        self.assertEqual(self.grid.occupancy(), {(7, 7): 1})
+
+class TestFlowField(unittest.TestCase):
+    def test_routes_around_wall(self):
+        from core.flow_field import FlowField
+        field = FlowField(cell_size=10, radius=5)
+        self.assertTrue(field.update((5, 5)))
+        self.assertFalse(field.update((8, 8))) # Same cell, nothing to do
+        self.assertTrue(field.clear[field.index_of(45, 5)])
+
+        # Vertical wall at x = 20..29 from y = -20 to 29, target at (5, 5)
+        field.add_obstacle(pygame.Rect(20, -20, 10, 50))
+        self.assertTrue(field.update((5, 5)))
+        behind = field.index_of(45, 5)
+        self.assertFalse(field.clear[behind])
+
+        # Following the arrows from behind the wall reaches the target without entering it
+        col, row = 4, 0
+        for _ in range(20):
+            if (col, row) == (0, 0):
+                break
+            index = field.index_of(col * 10 + 5, row * 10 + 5)
+            col += (field.dir_x[index] > 0) - (field.dir_x[index] < 0)
+            row += (field.dir_y[index] > 0) - (field.dir_y[index] < 0)
+            self.assertNotIn((col, row), field.blocked)
+        self.assertEqual((col, row), (0, 0))
+
+    def test_horde_follows_field_behind_obstacle(self):
+        from entities.entity_manager import EntityManager
+        from core.stats import GameStats
+        player = Player((0, 0))
+        entity_manager = EntityManager(player, GameStats(), None)
+        enemy = Enemy((200, 0), 'test_enemy', {'speed': 2}, player, entity_manager)
+        entity_manager.spawn_enemy(enemy)
+        entity_manager.flow_field.add_obstacle(pygame.Rect(64, -128, 64, 256))
+        widest = 0
+        for _ in range(300):
+            entity_manager.flow_field.update(player.rect.center)
+            entity_manager.horde.update(0)
+            widest = max(widest, abs(enemy.pos.y))
+        self.assertGreater(widest, 128) # Went round the wall instead of pushing into it
+        self.assertLess(enemy.pos.length(), 10)
+
+class TestEnemyHorde(unittest.TestCase):
+    def setUp(self):
+        from entities.entity_manager import EntityManager
+        from core.stats import GameStats
+        self.player = Player((0, 0))
+        self.entity_manager = EntityManager(self.player, GameStats(), None)
+        self.config = {'hp': 10, 'speed': 2, 'damage': 5, 'xp_value': 1}
+        self.enemies = [Enemy((100 * (i + 1), 0), 'test_enemy', self.config, self.player, self.entity_manager) for i in range(3)]
+        for enemy in self.enemies:
+            self.entity_manager.spawn_enemy(enemy)
+
+    def test_chase_moves_towards_player(self):
+        self.entity_manager.horde.update(0)
+        self.assertAlmostEqual(self.enemies[0].pos.x, 98)
+        self.assertEqual(self.enemies[0].rect.centerx, 98)
+
+    def test_kill_keeps_arrays_dense(self):
+        first, _, last = self.enemies
+        first.kill()
+        self.assertEqual(len(self.entity_manager.horde), 2)
+        self.assertEqual(last.horde_index, 0)
+        self.assertEqual(last.pos.x, 300)
+        self.assertEqual(first.pos.x, 100) # Dead enemies keep their last position
+        self.assertNotIn(first, self.entity_manager.enemy_grid)
+
+    def test_lod_tiers(self):
+        far = [Enemy((5000, 100 * i), 'test_enemy', self.config, self.player, self.entity_manager) for i in range(30)]
+        self.entity_manager.spawn_enemies(far)
+        horde = self.entity_manager.horde
+        queries = [0, 0, 0]
+        for step in range(30):
+            horde.update(0)
+            queries = [total + q for total, q in zip(queries, horde.tier_queries)]
+        self.assertEqual(horde.tier_sizes, [3, 0, 30])
+        self.assertEqual(queries, [3 * 30 // 3, 0, 30 * 30 // 15])
+
+    def test_batch_spawn_matches_single_spawn(self):
+        batch = [Enemy((0, 50 * i), 'test_enemy', self.config, self.player, self.entity_manager) for i in range(4)]
+        self.entity_manager.spawn_enemies(batch)
+        horde = self.entity_manager.horde
+        self.assertEqual(len(horde), 7)
+        self.assertEqual([e.horde_index for e in batch], [3, 4, 5, 6])
+        self.assertEqual((horde.y[6], horde.sep_x[6], len(horde.separates)), (150, 0, 7))
+        self.assertIn(batch[-1], self.entity_manager.enemy_grid)
+        self.assertEqual(len(self.entity_manager.enemies_group), 7)
+
+    def test_vectorized_step_matches_loop(self):
+        from unittest import mock
+        from entities import horde as horde_module
+        if horde_module.np is None:
+            self.skipTest("NumPy not installed")
+        import random
+        from entities.entity_manager import EntityManager
+        from core.stats import GameStats
+        
+        def run(np, steps):
+            random.seed(3)
+            entity_manager = EntityManager(self.player, GameStats(), None)
+            entity_manager.spawn_enemies([Enemy((random.uniform(-1200, 1200), random.uniform(-1200, 1200)), 'test_enemy', self.config, self.player, entity_manager) for _ in range(300)])
+            entity_manager.flow_field.add_obstacle(pygame.Rect(64, -128, 64, 256))
+            entity_manager.flow_field.update(self.player.rect.center)
+            horde = entity_manager.horde
+            with mock.patch.object(horde_module, 'np', np):
+                stats = []
+                for _ in range(steps):
+                    horde.update(0)
+                    stats.append((horde.tier_sizes, horde.tier_queries))
+            return [enemy.pos.xy for enemy in horde.enemies], stats
+        
+        self.assertEqual(run(None, 10)[1], run(horde_module.np, 10)[1])
+        # The loop separates against neighbours it already moved this step, so positions drift apart slowly
+        looped, vectorized = run(None, 1)[0], run(horde_module.np, 1)[0]
+        for a, b in zip(looped, vectorized):
+            self.assertLess(a.distance_to(b), 0.5)
+
+class TestSpawnerSchedule(unittest.TestCase):
+    def setUp(self):
+        from entities.entity_manager import EntityManager
+        from core.stats import GameStats
+        from core.clock import GameClock
+        self.clock = GameClock()
+        self.player = Player((0, 0))
+        self.entity_manager = EntityManager(self.player, GameStats(self.clock), None, self.clock)
+        self.spawner = Spawner(ConfigLoader(), self.player, self.entity_manager, clock=self.clock)
+
+    def test_wave_lookup(self):
+        for game_time, expected in ((0, 0), (29.9, 0), (30, 1), (299, 4), (5000, 7)):
+            self.spawner.game_time = game_time
+            self.assertEqual(self.spawner.current_wave_index(), expected)
+
+    def test_cap_is_enforced(self):
+        from entities.spawner import BASE_ENEMY_CAP
+        config = {'hp': 10, 'speed': 0, 'damage': 5, 'xp_value': 1}
+        self.entity_manager.spawn_enemies([
+            Enemy((1000, 0), 'test_enemy', config, self.player, self.entity_manager) for _ in range(BASE_ENEMY_CAP - 10)
+        ])
+        self.clock.ticks = 60000 # Horde time
+        self.spawner.start_ticks = 0
+        for _ in range(120):
+            self.spawner.update()
+        self.assertEqual(len(self.entity_manager.enemies_group), BASE_ENEMY_CAP)
+
+class TestEntityDraw(unittest.TestCase):
+    def test_offscreen_enemies_are_culled(self):
+        from entities.entity_manager import EntityManager
+        from core.stats import GameStats
+        from core.camera import Camera
+        player = Player((0, 0))
+        entity_manager = EntityManager(player, GameStats(), None)
+        config = {'hp': 10, 'speed': 1, 'damage': 5, 'xp_value': 1}
+        for pos in ((100, 0), (5000, 5000), (-4000, 0)):
+            entity_manager.spawn_enemy(Enemy(pos, 'test_enemy', config, player, entity_manager))
+        camera = Camera(1280, 720)
+        camera.update(player)
+        
+        entity_manager.draw(pygame.Surface((1280, 720)), camera)
+        self.assertEqual(entity_manager.drawn_count, 2) # Player and the nearby enemy
+        self.assertEqual(entity_manager.culled_count, 2)
+
+        # Only what was drawn is snapshotted for interpolation
+        entity_manager.snapshot_positions()
+        self.assertEqual(set(entity_manager.previous_positions), {player, entity_manager.horde.enemies[0]})
+
+class TestBackground(unittest.TestCase):
+    def test_small_tile_is_one_blit(self):
+        from core.background import Background
+        from core.camera import Camera
+        background = Background(1280, 720)
+        camera = Camera(1280, 720)
+        screen = pygame.Surface((1280, 720))
+        for pos in ((0, 0), (37, -90), (-1000, 333)):
+            camera.update(Player(pos))
+            background.draw(screen, camera)
+            # Grid lines still land where the old per-frame lines did
+            start_x = camera.camera.x % 64
+            start_y = camera.camera.y % 64
+            self.assertEqual(screen.get_at((start_x, start_y + 10))[:3], (40, 40, 40))
+            self.assertEqual(screen.get_at((start_x + 10, start_y + 10))[:3], (30, 30, 30))
+        self.assertEqual(background.surface.get_size(), (1344, 832))
+
+    def test_large_art_wraps(self):
+        from core.background import Background
+        background = Background(1280, 720, pygame.Surface((2048, 2048)))
+        self.assertEqual(background.surface.get_size(), (2048, 2048))
+
+class TestShapeAtlas(unittest.TestCase):
+    def test_fallback_sprites_are_shared(self):
+        from content.gem import Gem
+        from content.items import Heart
+        player = Player((0, 0))
+        config = {'width': 20, 'height': 20, 'color': [1, 2, 3]}
+        a = Enemy((0, 0), 'test', config, player)
+        b = Enemy((50, 50), 'test', config, player)
+        self.assertIs(a.image, b.image)
+        self.assertEqual(a.image.get_at((10, 10))[:3], (1, 2, 3))
+        self.assertIs(Gem((0, 0), player).image, Gem((5, 5), player).image)
+
+        # Transparent shapes use a colorkey instead of per-pixel alpha
+        heart = Heart((0, 0)).image
+        self.assertIsNotNone(heart.get_colorkey())
+        self.assertEqual(heart.get_at((8, 14))[:3], (255, 50, 50))
+
+class TestAssetPack(unittest.TestCase):
+    def test_round_trip(self):
+        import os
+        import tempfile
+        from core.asset_pack import AssetPack, write_pack
+        with tempfile.TemporaryDirectory() as tmp:
+            sprite = pygame.Surface((4, 2), pygame.SRCALPHA)
+            sprite.fill((10, 20, 30, 255))
+            pygame.image.save(sprite, os.path.join(tmp, "bat.png"))
+
+            pack_path = os.path.join(tmp, "assets.pack")
+            written = write_pack(pack_path, {("bat.png", (8, 8)), ("bat.png", None), ("missing.png", None)}, tmp)
+            self.assertEqual(sorted(written), ["bat.png", "bat.png@8x8"])
+
+            pack = AssetPack(pack_path)
+            self.assertEqual(sorted(pack.sprites(), key=str), [("bat.png", (8, 8)), ("bat.png", None)])
+            scaled = pack.load("bat.png", (8, 8))
+            self.assertEqual(scaled.get_size(), (8, 8))
+            self.assertEqual(scaled.get_at((7, 7)), (10, 20, 30, 255))
+            self.assertEqual(pack.load("bat.png").get_size(), (4, 2))
+            self.assertIsNone(pack.load("bat.png", (16, 16)))
+            st = os.stat(os.path.join(tmp, "bat.png"))
+            self.assertIsNotNone(pack.load("bat.png", None, (st.st_mtime_ns, st.st_size)))
+            self.assertIsNone(pack.load("bat.png", None, (st.st_mtime_ns + 1, st.st_size)))
+            pack.data.close()
+
+    def test_edited_sprite_outranks_stale_pack(self):
+        import os
+        import tempfile
+        from unittest import mock
+        from core.asset_pack import AssetPack, write_pack
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bat.png")
+            sprite = pygame.Surface((4, 2), pygame.SRCALPHA)
+            pygame.image.save(sprite, path)
+            pack_path = os.path.join(tmp, "assets.pack")
+            write_pack(pack_path, {(path, None)}, "")
+            pack = AssetPack(pack_path)
+
+            pygame.image.save(pygame.Surface((6, 6), pygame.SRCALPHA), path)
+            with mock.patch.object(ConfigLoader, '_pack', pack), mock.patch.object(ConfigLoader, '_pack_checked', True), \
+                    mock.patch.dict(ConfigLoader._image_cache, clear=True):
+                self.assertEqual(ConfigLoader.load_image(path).get_size(), (6, 6))
+            pack.data.close()
+
+class TestConfigCache(unittest.TestCase):
+    def test_compiled_config_is_shared_and_invalidated(self):
+        import os
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            config_dir = os.path.join(tmp, "config")
+            cache_dir = os.path.join(tmp, "cache")
+            os.makedirs(config_dir)
+            path = os.path.join(config_dir, "enemies.yaml")
+            with open(path, "w") as f:
+                f.write("enemies:\n  - id: bat\n    hp: 5\n  - hp: 1\n")
+
+            first = ConfigLoader(config_dir, cache_dir).load_enemies()
+            self.assertEqual(first, {'bat': {'id': 'bat', 'hp': 5}}) # Entry without an id is dropped
+            self.assertIs(ConfigLoader(config_dir, cache_dir).load_enemies(), first)
+
+            # A new process reads the compiled copy instead of parsing YAML
+            from unittest import mock
+            ConfigLoader._config_cache.clear()
+            with mock.patch.object(ConfigLoader, 'compile_config', side_effect=AssertionError("YAML was re-parsed")):
+                self.assertEqual(ConfigLoader(config_dir, cache_dir).load_enemies(), first)
+
+            with open(path, "w") as f:
+                f.write("enemies:\n  - id: bat\n    hp: 7\n")
+            os.utime(path, ns=(1, 1))
+            self.assertEqual(ConfigLoader(config_dir, cache_dir).load_enemies()['bat']['hp'], 7)
+
+    def test_compiled_config_survives_a_moved_config_dir(self):
+        # A onefile build unpacks its configs to a fresh temp folder on every launch
+        import os
+        import shutil
+        import tempfile
+        from unittest import mock
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_dir = os.path.join(tmp, "cache")
+            first_dir = os.path.join(tmp, "run1")
+            os.makedirs(first_dir)
+            with open(os.path.join(first_dir, "weapons.yaml"), "w") as f:
+                f.write("weapons:\n  - id: 1\n    damage: 4\n")
+            first = ConfigLoader(first_dir, cache_dir).load_weapons()
+            self.assertEqual(first, {1: {'id': 1, 'damage': 4}})
+
+            second_dir = shutil.copytree(first_dir, os.path.join(tmp, "run2"))
+            ConfigLoader._config_cache.clear()
+            with mock.patch.object(ConfigLoader, 'compile_config', side_effect=AssertionError("YAML was re-parsed")):
+                self.assertEqual(ConfigLoader(second_dir, cache_dir).load_weapons(), first)
+
+    def test_unusable_compiled_config_is_ignored(self):
+        import marshal
+        import os
+        import pickle
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            config_dir = os.path.join(tmp, "config")
+            os.makedirs(config_dir)
+            with open(os.path.join(config_dir, "enemies.yaml"), "w") as f:
+                f.write("enemies:\n  - id: bat\n")
+            loader = ConfigLoader(config_dir, os.path.join(tmp, "cache"))
+            os.makedirs(loader.cache_dir)
+            for planted in (pickle.dumps(os.system), b"\x00garbage", marshal.dumps([1, 2])):
+                with open(loader.compiled_path("enemies.yaml"), "wb") as f:
+                    f.write(planted)
+                ConfigLoader._config_cache.clear()
+                self.assertEqual(loader.load_enemies(), {'bat': {'id': 'bat'}})
+
+class TestTextCache(unittest.TestCase):
+    def test_render_is_cached_and_bounded(self):
+        from core.text import TextCache
+        first = TextCache.render("Kills: 1", 24, (255, 255, 255))
+        self.assertIs(TextCache.render("Kills: 1", 24, [255, 255, 255]), first)
+        self.assertIsNot(TextCache.render("Kills: 1", 24, (255, 0, 0)), first)
+
+        old_max = TextCache.max_surfaces
+        TextCache.max_surfaces = 2
+        try:
+            for i in range(3):
+                TextCache.render(str(i), 24, (255, 255, 255))
+            self.assertEqual(len(TextCache._surfaces), 2)
+            self.assertIsNot(TextCache.render("Kills: 1", 24, (255, 255, 255)), first)
+        finally:
+            TextCache.max_surfaces = old_max
+
+class TestBroadphase(unittest.TestCase):
+    def test_query_counts_candidates_and_hits(self):
+        from core.broadphase import Broadphase
+        from core.spatial_hash import SpatialHash
+        broadphase = Broadphase()
+        broadphase.add_layer('enemies', SpatialHash(cell_size=64))
+        near = pygame.sprite.Sprite()
+        near.rect = pygame.Rect(0, 0, 64, 64) # Centre outside the query, rect overlaps
+        grazing = pygame.sprite.Sprite()
+        grazing.rect = pygame.Rect(70, 0, 8, 8) # Same cell, no overlap
+        far = pygame.sprite.Sprite()
+        far.rect = pygame.Rect(1000, 1000, 8, 8)
+        for sprite in (near, grazing, far):
+            broadphase.insert('enemies', sprite)
+
+        broadphase.begin_frame()
+        hits = broadphase.query('enemies', pygame.Rect(60, 60, 10, 10))
+        self.assertEqual(hits, [near])
+        self.assertEqual(broadphase.hits, 1)
+        self.assertEqual(broadphase.candidate_pairs, 2)
+
+class TestFixedTimestep(unittest.TestCase):
+    def test_steps_and_alpha(self):
+        from core.timestep import FixedTimestep
+        timestep = FixedTimestep(dt=10, max_frame_time=100)
+        self.assertEqual(timestep.advance(25), 2)
+        self.assertAlmostEqual(timestep.alpha, 0.5)
+        self.assertEqual(timestep.advance(5), 1)
+        self.assertAlmostEqual(timestep.alpha, 0.0)
+
+    def test_long_frames_are_clamped(self):
+        from core.timestep import FixedTimestep
+        timestep = FixedTimestep(dt=10, max_frame_time=100)
+        self.assertEqual(timestep.advance(5000), 10)
+
 class TestGameStats(unittest.TestCase):
     def test_time_survived(self):
         from core.stats import GameStats
-        stats = GameStats()
+        from core.clock import GameClock
+        clock = GameClock()
+        stats = GameStats(clock)
         stats.start_ticks = 1000
         stats.end_ticks = 0
+        clock.ticks = 2000
         
-        # Mock pygame.time.get_ticks
-        original_get_ticks = pygame.time.get_ticks
-        pygame.time.get_ticks = lambda: 2000
+        # Running state
+        self.assertEqual(stats.get_time_survived(), 1.0)
         
-        try:
-            # Running state
-            self.assertEqual(stats.get_time_survived(), 1.0)
-            
-            # Game over state
-            stats.end_ticks = 5000
-            self.assertEqual(stats.get_time_survived(), 4.0)
-        finally:
-            pygame.time.get_ticks = original_get_ticks
+        # Game over state
+        stats.end_ticks = 5000
+        self.assertEqual(stats.get_time_survived(), 4.0)
+
+class TestLoadShedding(unittest.TestCase):
+    def test_over_budget_frames_throttle_spawning(self):
+        from core.director import Director, MIN_LOAD_FACTOR
+        from core.profiler import Profiler
+        from core.stats import GameStats
+        from entities.entity_manager import EntityManager
+        player = Player((0, 0))
+        profiler = Profiler()
+        entity_manager = EntityManager(player, GameStats(), None)
+        for i in range(4):
+            entity_manager.add_pickup(Gem((1000 + i, 1000), player, 2), entity_manager.gems_group)
+        entity_manager.add_pickup(Gem((10, 10), player, 2), entity_manager.gems_group) # Near the player
+        director = Director(player, GameStats(), profiler=profiler, entity_manager=entity_manager, frame_budget=20)
+
+        director.shed_load() # No samples yet
+        self.assertEqual(director.load_factor, 1.0)
+
+        for _ in range(200):
+            profiler.update(40)
+        director.shed_load()
+        self.assertLess(director.load_factor, 1.0)
+        self.assertLess(director.get_spawn_rate_multiplier(), director.difficulty_multiplier)
+        self.assertEqual(len(entity_manager.gems_group), 2)
+        self.assertEqual(sum(gem.value for gem in entity_manager.gems_group), 10)
+
+        for _ in range(20):
+            director.shed_load()
+        self.assertEqual(director.load_factor, MIN_LOAD_FACTOR)
+
+        for _ in range(240):
+            profiler.update(10)
+        director.shed_load()
+        self.assertGreater(director.load_factor, MIN_LOAD_FACTOR)
+
+class TestGameClock(unittest.TestCase):
+    def test_pause_and_time_scale(self):
+        from core.clock import GameClock
+        clock = GameClock(dt=10)
+        self.assertEqual(clock.advance(20), 2)
+        clock.pause()
+        self.assertEqual(clock.advance(1000), 0)
+        clock.resume()
+        clock.set_time_scale(4.0)
+        self.assertEqual(clock.advance(10), 4)
+
+    def test_time_scale_applies_after_hitch_clamp(self):
+        from core.clock import GameClock
+        from core.timestep import MAX_FRAME_TIME
+        clock = GameClock(dt=10)
+        clock.set_time_scale(100.0)
+        self.assertEqual(clock.advance(20), 200) # Not capped at MAX_FRAME_TIME of game time
+        self.assertEqual(clock.advance(10000), MAX_FRAME_TIME * 100 // 10) # The real hitch still is
+
+    def test_manual_stepping(self):
+        from core.clock import GameClock
+        clock = GameClock(dt=10)
+        for _ in range(3):
+            clock.step()
+        self.assertEqual(clock.get_ticks(), 30)
+
+    def test_player_invulnerability_uses_game_time(self):
+        from core.clock import GameClock
+        clock = GameClock(dt=100)
+        player = Player((0, 0), clock=clock)
+        player.take_damage(10)
+        player.take_damage(10) # Still invulnerable
+        self.assertEqual(player.hp, 90)
+        for _ in range(6):
+            clock.step()
+        player.take_damage(10)
+        self.assertEqual(player.hp, 80)
+
+    def test_timers_fire_in_order_and_cancel(self):
+        from core.clock import GameClock
+        clock = GameClock(dt=10)
+        fired = []
+        clock.call_later(25, fired.append, 'b')
+        clock.call_later(5, fired.append, 'a')
+        cancelled = clock.call_later(15, fired.append, 'x')
+        cancelled.cancel()
+        cancelled.cancel() # Idempotent
+        self.assertEqual(len(clock.timers), 2)
+        clock.step()
+        self.assertEqual(fired, ['a'])
+        clock.step()
+        clock.step()
+        self.assertEqual(fired, ['a', 'b'])
+        self.assertEqual(len(clock.timers), 0)
+        self.assertEqual(clock.timers.heap, [])
+
+    def test_projectile_expires_once(self):
+        from core.clock import GameClock
+        from content.projectile import Projectile
+        clock = GameClock(dt=100)
+        group = pygame.sprite.Group()
+        proj = Projectile((0, 0), (10, 0), {'duration': 250}, clock)
+        group.add(proj)
+        clock.step()
+        clock.step()
+        self.assertTrue(proj.alive())
+        clock.step()
+        self.assertFalse(proj.alive())
+
+        # Killed early: its lifetime timer is cancelled
+        proj = Projectile((0, 0), (10, 0), {'duration': 250}, clock)
+        group.add(proj)
+        proj.kill()
+        self.assertEqual(len(clock.timers), 0)
+
+class TestObjectPool(unittest.TestCase):
+    def test_killed_gems_are_recycled(self):
+        from core.pool import ObjectPool
+        from content.gem import Gem
+        player = Player((0, 0))
+        pool = ObjectPool(Gem, cap=1)
+        group = pygame.sprite.Group()
+        
+        gem = pool.acquire((10, 10), player, 5)
+        group.add(gem)
+        gem.kill()
+        gem.kill() # Killing twice must not release twice
+        self.assertEqual(len(pool.free), 1)
+        
+        recycled = pool.acquire((50, 60), player, 2)
+        self.assertIs(recycled, gem)
+        self.assertEqual(recycled.value, 2)
+        self.assertEqual(recycled.rect.center, (50, 60))
+        self.assertEqual((pool.hits, pool.misses), (1, 1))
+
+    def test_cap_limits_free_list(self):
+        from core.pool import ObjectPool
+        from content.gem import Gem
+        player = Player((0, 0))
+        pool = ObjectPool(Gem, cap=1)
+        group = pygame.sprite.Group()
+        gems = [pool.acquire((0, 0), player) for _ in range(3)]
+        group.add(*gems)
+        for gem in gems:
+            gem.kill()
+        self.assertEqual(len(pool.free), 1)
+
+class TestWeaponController(unittest.TestCase):
+    class Loader:
+        def load_weapons(self):
+            return {
+                'wand': {'name': 'Wand', 'type': 'projectile', 'damage': 10, 'cooldown': 1000, 'speed': 5.0},
+                'whip': {'name': 'Whip', 'type': 'melee', 'damage': 10, 'cooldown': 1500, 'area': [50, 50]},
+            }
+
+    def setUp(self):
+        from core.clock import GameClock
+        from core.stats import GameStats
+        from content.weapon import WeaponController
+        from content.upgrades import UpgradeManager
+        from entities.entity_manager import EntityManager
+        self.clock = GameClock()
+        self.player = Player((0, 0))
+        stats = GameStats(self.clock)
+        self.entity_manager = EntityManager(self.player, stats, None, self.clock)
+        self.controller = WeaponController(self.player, self.entity_manager, self.Loader(), stats, self.clock)
+        self.upgrades = UpgradeManager(self.player, self.controller)
+
+    def advance(self, ms):
+        self.clock.ticks += ms
+
+    def test_weapons_fire_from_queue_when_due(self):
+        self.controller.add_weapon('wand')
+        self.controller.add_weapon('whip')
+        self.controller.update() # Nothing due at t=0
+        self.assertEqual(len(self.entity_manager.projectiles_group), 0)
+
+        self.advance(1000)
+        self.controller.update()
+        self.assertEqual(len(self.entity_manager.projectiles_group), 1)
+        self.advance(500)
+        self.controller.update()
+        self.assertEqual(len(self.entity_manager.projectiles_group), 2)
+        self.assertEqual([entry[2]['id'] for entry in sorted(self.controller.fire_queue)], ['wand', 'whip'])
+
+    def test_zero_cooldown_fires_once_per_step(self):
+        self.controller.weapon_configs['wand']['cooldown'] = 1
+        self.controller.add_weapon('wand')
+        self.upgrades.apply_upgrade({'type': 'weapon_stat', 'stat': 'cooldown', 'amount': 0.9, 'name': 'Fire Rate Up'})
+        wand = self.controller.active_weapons[0]
+        self.assertEqual(wand['config']['cooldown'], 0)
+        self.assertGreater(wand['stats'].cooldown, 0)
+
+        for _ in range(3):
+            self.clock.step()
+            self.controller.update() # Must return after a single shot
+        self.assertEqual(len(self.entity_manager.projectiles_group), 3)
+
+    def test_upgrades_recompile_stats(self):
+        self.controller.add_weapon('wand')
+        wand = self.controller.active_weapons[0]
+        stats = wand['stats']
+        self.controller.update()
+        self.assertIs(wand['stats'], stats) # Cached between upgrades
+
+        self.upgrades.apply_upgrade({'type': 'weapon_stat', 'stat': 'damage', 'amount': 2, 'name': 'Damage Up'})
+        self.upgrades.apply_upgrade({'type': 'modifier', 'stat': 'cooldown', 'amount': -0.5, 'name': 'Haste'})
+        self.upgrades.apply_upgrade({'type': 'modifier', 'stat': 'amount', 'amount': 1, 'name': 'Duplicator'})
+        stats = wand['stats']
+        self.assertEqual((stats.damage, stats.cooldown, stats.amount), (12, 500, 2))
+
+        self.advance(500) # The new cooldown applies to the pending shot too
+        self.controller.update()
+        shots = list(self.entity_manager.projectiles_group)
+        self.assertEqual(len(shots), 2)
+        self.assertTrue(all(shot.damage == 12 for shot in shots))
+
+class TestGems(unittest.TestCase):
+    def setUp(self):
+        from core.stats import GameStats
+        from entities.entity_manager import EntityManager
+        self.player = Player((0, 0))
+        self.entity_manager = EntityManager(self.player, GameStats(), None, gem_cell_limit=3)
+
+    def drop(self, pos, value=1):
+        gem = Gem(pos, self.player, value)
+        self.entity_manager.add_pickup(gem, self.entity_manager.gems_group)
+        return gem
+
+    def test_only_gems_in_magnet_radius_wake(self):
+        near = self.drop((100, 0))
+        far = self.drop((2000, 0))
+        self.entity_manager.update_gems()
+        self.assertEqual(list(self.entity_manager.awake_gems), [near])
+        self.assertLess(near.pos.x, 100)
+        self.assertEqual(far.pos.x, 2000)
+
+    def test_crowded_far_cells_merge(self):
+        for i in range(5):
+            self.drop((2000 + i, 2000), 2)
+        for i in range(3):
+            self.drop((2000 + i, 3000), 2) # At the limit: left alone
+        merged = self.entity_manager.merge_crowded_gems()
+        self.assertEqual(merged, 4)
+        self.assertEqual(len(self.entity_manager.gems_group), 4)
+        self.assertEqual(len(self.entity_manager.gem_grid), 4)
+        self.assertEqual(sum(gem.value for gem in self.entity_manager.gems_group), 16)
+
+    def test_vacuum_folds_far_gems_into_one(self):
+        near = [self.drop((300 + i, 0)) for i in range(3)]
+        for i in range(10):
+            self.drop((5000 + 200 * i, 0), 3)
+        folded = self.entity_manager.vacuum_gems()
+        self.assertEqual(folded, 9)
+        awake = set(self.entity_manager.awake_gems)
+        self.assertEqual(len(awake), 4)
+        self.assertTrue(all(gem.being_vacuumed for gem in awake))
+        self.assertTrue(set(near) <= awake)
+        self.assertEqual(sum(gem.value for gem in self.entity_manager.gems_group), 33)
+        carrier = (awake - set(near)).pop()
+        self.assertEqual(carrier.rect.center, (5000, 0)) # The nearest far gem carries the rest
+        self.assertIn(carrier, self.entity_manager.gem_grid)
+
+    def test_vacuum_folds_frozen_gems_into_carrier(self):
+        from content.items import Heart
+        manager = self.entity_manager
+        manager.stream_chunks()
+        for i in range(3):
+            self.drop((-5000, 100 * i), 4)
+        self.drop((-9000, 0), 5)
+        manager.add_pickup(Heart((-5000, 500)), manager.items_group)
+        self.player.rect.center = (5000, 0)
+        manager.stream_chunks()
+        self.assertEqual(len(manager.chunks), 5)
+        self.assertEqual(len(manager.gems_group), 0)
+
+        # Nothing live far away: the nearest frozen gem comes back as the carrier
+        self.assertEqual(manager.vacuum_gems(), 3)
+        self.assertEqual(len(manager.chunks), 1) # Only the heart stays frozen
+        (carrier,) = manager.gems_group
+        self.assertEqual((carrier.rect.centerx, carrier.value), (-5000, 17))
+        self.assertTrue(carrier.being_vacuumed)
+        self.assertIn(carrier, manager.awake_gems)
+        self.assertIn(carrier, manager.gem_grid)
+
+        # With a nearer live far gem, it carries the old carrier and the frozen XP
+        manager.chunks.freeze(0, -9000, 0, 6)
+        far = self.drop((1000, 3000), 2)
+        self.assertEqual(manager.vacuum_gems(), 2)
+        self.assertEqual(far.value, 25)
+        self.assertFalse(carrier.alive())
+        self.assertEqual(len(manager.chunks), 1)
+
+    def test_far_pickups_freeze_and_thaw(self):
+        from content.items import Heart
+        manager = self.entity_manager
+        gem = self.drop((500, 0), 7)
+        manager.add_pickup(Heart((600, 40)), manager.items_group)
+        manager.stream_chunks()
+        self.assertEqual(len(manager.chunks), 0)
+
+        self.player.rect.center = (10000, 0)
+        manager.stream_chunks()
+        self.assertEqual(len(manager.chunks), 2)
+        self.assertFalse(gem.alive())
+        self.assertEqual(len(manager.gems_group) + len(manager.items_group), 0)
+        self.assertEqual(len(manager.gem_grid) + len(manager.broadphase.layers['pickups']), 0)
+
+        self.player.rect.center = (0, 0)
+        manager.stream_chunks()
+        self.assertEqual(len(manager.chunks), 0)
+        (thawed,) = manager.gems_group
+        self.assertEqual((thawed.rect.center, thawed.value), ((500, 0), 7))
+        (heart,) = manager.items_group
+        self.assertEqual(heart.rect.center, (600, 40))
+        self.assertIn(heart, manager.broadphase.layers['pickups'])
+
+class TestParticleSystem(unittest.TestCase):
+    def setUp(self):
+        from core.clock import GameClock
+        from content.particles import ParticleSystem
+        self.particles = ParticleSystem(GameClock(), capacity=16)
+
+    def test_budget_is_hard(self):
+        for _ in range(5):
+            self.particles.create_explosion((0, 0), (255, 0, 0))
+        self.assertEqual(len(self.particles), 16)
+
+    def test_particles_expire(self):
+        self.particles.create_hit((0, 0))
+        for _ in range(10):
+            self.particles.update()
+        self.assertEqual(len(self.particles), 3)
+        self.particles.update()
+        self.assertEqual(len(self.particles), 0)
+        self.assertEqual(self.particles.used, 0)
+
+    def test_array_step_matches_loop(self):
+        from unittest import mock
+        from content import particles
+        if particles.np is None:
+            self.skipTest("NumPy not installed")
+        import random
+        results = []
+        for np in (None, particles.np):
+            random.seed(5)
+            system = particles.ParticleSystem(self.particles.clock, capacity=16)
+            with mock.patch.object(particles, 'np', np):
+                system.create_explosion((0, 0), (255, 0, 0), count=8)
+                for step in range(35):
+                    if step == 25:
+                        system.create_explosion((9, 9), (0, 255, 0), count=4)
+                    system.update()
+            results.append((len(system), system.used, list(system.x), list(system.lifetime), [i is None for i in system.images]))
+        self.assertEqual(results[0], results[1])
+
+    def test_hits_merge_per_region(self):
+        for _ in range(5):
+            self.particles.create_hit((10, 10))
+        self.particles.create_hit((500, 10))
+        self.particles.update()
+        self.assertEqual(len(self.particles), 6 + 3) # One capped burst per region
+
+    def test_quality_drops_over_budget(self):
+        from core.clock import GameClock
+        from core.profiler import Profiler
+        from content.particles import EffectsQuality
+        clock = GameClock()
+        profiler = Profiler()
+        quality = EffectsQuality(self.particles, profiler, clock, frame_budget=20)
+        for _ in range(60):
+            profiler.update(35)
+        clock.ticks = 1000
+        quality.update()
+        self.assertEqual(self.particles.quality_name, 'medium')
+        clock.ticks = 2000
+        quality.update()
+        self.particles.create_hit((0, 0)) # Hit sparks are off at low quality
+        self.particles.create_explosion((0, 0), (255, 0, 0))
+        self.particles.update()
+        self.assertEqual(len(self.particles), 4)
+
+class TestHeadlessWorld(unittest.TestCase):
+    def test_run_headless_advances_game_time(self):
+        from core.world import run_headless
+        world = run_headless(10, seed=1, invincible=True)
+        self.assertGreaterEqual(world.stats.get_time_survived(), 10)
+        self.assertGreater(len(world.entity_manager.enemies_group), 0)
+
+    def test_counters_only_while_profiling(self):
+        from core.world import World
+        world = World(ConfigLoader(), player_input=False)
+        world.step()
+        self.assertEqual(world.profiler.counters, {})
+        world.profiler.enabled = True
+        world.step()
+        self.assertIn("frozen pickups", world.profiler.counters)
+
+    def test_same_seed_reproduces_run(self):
+        from core.world import run_headless
+        def summary():
+            world = run_headless(120, seed=1, invincible=True)
+            stats = world.stats
+            enemies = sorted(enemy.rect.center for enemy in world.entity_manager.enemies_group)
+            return (stats.enemies_killed, stats.damage_dealt, stats.shots_fired,
+                    world.player.level, world.player.xp, enemies)
+        self.assertEqual(summary(), summary())
 
 if __name__ == '__main__':
     unittest.main()
@@ -12,6 +12,7 @@ class MockEntityManager:
         self.all_sprites = pygame.sprite.Group()
         self.enemies_group = pygame.sprite.Group()
     def spawn_enemy(self, enemy): pass
+    def spawn_enemies(self, enemies): pass
     def add_enemy(self, enemy): pass
 
 class TestSpawnerWaves(unittest.TestCase):
@@ -1,11 +1,17 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+import sys
 
+# Bake assets.pack first: it is a build artifact, so a clean checkout doesn't have one
+sys.path.insert(0, SPECPATH)
+from pack_assets import pack
+pack(os.path.join(SPECPATH, 'assets.pack'))
 
 a = Analysis(
     ['src/main.py'],
     pathex=[],
     binaries=[],
-    datas=[('config', 'config'), ('assets', 'assets')],
+    datas=[('config', 'config'), ('assets', 'assets'), ('assets.pack', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},